@@ -4,9 +4,12 @@ Diagram Controller - API Endpoints for Diagram Operations
 Handles diagram generation and preview.
 """
 import base64
-from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import Response
+from typing import AsyncIterator, TypeVar
 
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+
+from app.core.exceptions import ConfigurationError, ValidationError
 from app.services.diagram_service import DiagramService
 from app.services.render_service import RenderService
 from app.schemas.diagram_schema import (
@@ -18,6 +21,8 @@ from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
 router = APIRouter(prefix="/api/diagram", tags=["Diagrams"])
 
 
@@ -26,10 +31,25 @@ def get_diagram_service() -> DiagramService:
     return DiagramService()
 
 
+def _sse_event(event: str, data: str) -> str:
+    """Format a server-sent event; multi-line data becomes several data fields."""
+    # splitlines also breaks on \r, which SSE parsers treat as a line end
+    lines = "".join(f"data: {line}\n" for line in data.splitlines() or [""])
+    return f"event: {event}\n{lines}\n"
+
+
+async def _prepend(first: T, rest: AsyncIterator[T]) -> AsyncIterator[T]:
+    """Yield an already-received item, then the remainder of an async iterator."""
+    yield first
+    async for item in rest:
+        yield item
+
+
 @router.post("/generate", tags=["Diagrams"])
 async def generate_diagram(
     request_data: GenerateDiagramRequest,
-    http_request: Request
+    http_request: Request,
+    service: DiagramService = Depends(get_diagram_service)
 ):
     """
     Generate a diagram from a natural language prompt.
@@ -45,13 +65,14 @@ async def generate_diagram(
         - JSON response with base64-encoded image if Accept: application/json
     """
     logger.info(
-        f"Generate diagram request: format={request_data.format}, "
-        f"layout={request_data.layout}, prompt='{request_data.prompt[:50]}...'"
+        "Generate diagram request: format=%s, "
+        "layout=%s, prompt='%.50s...'",
+        request_data.format,
+        request_data.layout,
+        request_data.prompt
     )
     
     try:
-        service = get_diagram_service()
-        
         # Generate diagram
         image_bytes, dot_code = await service.generate_diagram(
             prompt=request_data.prompt,
@@ -78,18 +99,96 @@ async def generate_diagram(
                 media_type=mime_type
             )
             
+    except ValidationError:
+        # Rejected prompts are client errors, handled by the error middleware
+        raise
     except Exception as e:
-        logger.error(f"Diagram generation failed: {e}")
+        logger.error("Diagram generation failed: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to generate diagram: {str(e)}"
         )
 
 
+@router.post("/stream", tags=["Diagrams"])
+async def stream_diagram(
+    request_data: GenerateDiagramRequest,
+    service: DiagramService = Depends(get_diagram_service)
+):
+    """
+    Generate a diagram and stream progress as server-sent events.
+    
+    Events:
+        - token: raw LLM output chunks as they are generated
+        - result: JSON DiagramResponse with the final DOT code and image
+        - error: error message if generation or rendering fails
+    """
+    logger.info(
+        "Stream diagram request: format=%s, "
+        "layout=%s, prompt='%.50s...'",
+        request_data.format,
+        request_data.layout,
+        request_data.prompt
+    )
+    
+    # Run the stream up to its first event before committing to a 200, so
+    # rejected prompts and setup failures still get a proper status code
+    events = service.stream_dot_code(request_data.prompt)
+    try:
+        first_event = await anext(events)
+    except (ValidationError, ConfigurationError):
+        raise
+    except Exception as e:
+        logger.error("Diagram streaming failed: %s", e)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate diagram: {str(e)}"
+        )
+    
+    async def event_stream():
+        try:
+            dot_code = None
+            async for event, data in _prepend(first_event, events):
+                if event == "dot":
+                    dot_code = data
+                else:
+                    yield _sse_event(event, data)
+            
+            image_bytes = await service.preview_diagram(
+                dot_code=dot_code,
+                format=request_data.format,
+                layout=request_data.layout or "dot"
+            )
+            response = DiagramResponse(
+                diagram_dot=dot_code,
+                image_base64=base64.b64encode(image_bytes).decode("utf-8"),
+                format=request_data.format
+            )
+            yield _sse_event("result", response.model_dump_json())
+            
+        # Headers are already sent, so errors are reported in-stream
+        except ValidationError as e:
+            logger.warning("Diagram streaming rejected: %s", e.message)
+            yield _sse_event("error", f"Invalid request: {e.message}")
+        except ConfigurationError as e:
+            logger.error("Diagram streaming misconfigured: %s", e.message)
+            yield _sse_event("error", f"Service configuration error: {e.message}")
+        except Exception as e:
+            logger.error("Diagram streaming failed: %s", e)
+            yield _sse_event("error", f"Failed to generate diagram: {str(e)}")
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
 @router.post("/preview", tags=["Diagrams"])
 async def preview_diagram(
     request_data: PreviewDiagramRequest,
-    http_request: Request
+    http_request: Request,
+    service: DiagramService = Depends(get_diagram_service)
 ):
     """
     Preview/render a diagram from Graphviz DOT code directly (no LLM call).
@@ -100,11 +199,9 @@ async def preview_diagram(
         - Image response (image/svg+xml or image/png) by default
         - JSON response with base64-encoded image if Accept: application/json
     """
-    logger.info(f"Preview diagram request: format={request_data.format}, layout={request_data.layout}")
+    logger.info("Preview diagram request: format=%s, layout=%s", request_data.format, request_data.layout)
     
     try:
-        service = get_diagram_service()
-        
         # Preview diagram (no LLM, no DB save)
         image_bytes = await service.preview_diagram(
             dot_code=request_data.dot,
@@ -132,7 +229,7 @@ async def preview_diagram(
             )
             
     except Exception as e:
-        logger.error(f"Diagram preview failed: {e}")
+        logger.error("Diagram preview failed: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to preview diagram: {str(e)}"
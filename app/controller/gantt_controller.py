@@ -4,9 +4,10 @@ Gantt Controller - API Endpoints for Gantt Chart Operations
 Handles Gantt chart diagram generation and preview.
 """
 import base64
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import Response
 
+from app.core.exceptions import ValidationError
 from app.services.gantt_service import GanttService
 from app.services.mermaid_service import MermaidService
 from app.schemas.gantt_schema import (
@@ -29,7 +30,8 @@ def get_gantt_service() -> GanttService:
 @router.post("/generate", tags=["Gantt"])
 async def generate_gantt(
     request_data: GenerateGanttRequest,
-    http_request: Request
+    http_request: Request,
+    service: GanttService = Depends(get_gantt_service)
 ):
     """
     Generate a Gantt chart from a natural language prompt.
@@ -45,13 +47,13 @@ async def generate_gantt(
         - JSON response with base64-encoded image if Accept: application/json
     """
     logger.info(
-        f"Generate Gantt request: format={request_data.format}, "
-        f"prompt='{request_data.prompt[:50]}...'"
+        "Generate Gantt request: format=%s, "
+        "prompt='%.50s...'",
+        request_data.format,
+        request_data.prompt
     )
     
     try:
-        service = get_gantt_service()
-        
         # Generate Gantt chart
         image_bytes, mermaid_code = await service.generate_gantt(
             prompt=request_data.prompt,
@@ -77,8 +79,11 @@ async def generate_gantt(
                 media_type=mime_type
             )
             
+    except ValidationError:
+        # Rejected prompts are client errors, handled by the error middleware
+        raise
     except Exception as e:
-        logger.error(f"Gantt generation failed: {e}")
+        logger.error("Gantt generation failed: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to generate Gantt chart: {str(e)}"
@@ -88,7 +93,8 @@ async def generate_gantt(
 @router.post("/preview", tags=["Gantt"])
 async def preview_gantt(
     request_data: PreviewGanttRequest,
-    http_request: Request
+    http_request: Request,
+    service: GanttService = Depends(get_gantt_service)
 ):
     """
     Preview/render a Gantt chart from Mermaid code directly (no LLM call).
@@ -99,11 +105,9 @@ async def preview_gantt(
         - Image response (image/svg+xml or image/png) by default
         - JSON response with base64-encoded image if Accept: application/json
     """
-    logger.info(f"Preview Gantt request: format={request_data.format}")
+    logger.info("Preview Gantt request: format=%s", request_data.format)
     
     try:
-        service = get_gantt_service()
-        
         # Preview Gantt chart (no LLM, no DB save)
         image_bytes = await service.preview_gantt(
             mermaid_code=request_data.mermaid_code,
@@ -130,7 +134,7 @@ async def preview_gantt(
             )
             
     except Exception as e:
-        logger.error(f"Gantt preview failed: {e}")
+        logger.error("Gantt preview failed: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to preview Gantt chart: {str(e)}"
@@ -4,9 +4,10 @@ WBS Controller - API Endpoints for WBS Diagram Operations
 Handles Work Breakdown Structure diagram generation and preview.
 """
 import base64
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import Response
 
+from app.core.exceptions import ValidationError
 from app.services.wbs_service import WBSService
 from app.services.plantuml_service import PlantUMLService
 from app.schemas.wbs_schema import (
@@ -29,7 +30,8 @@ def get_wbs_service() -> WBSService:
 @router.post("/generate", tags=["WBS"])
 async def generate_wbs(
     request_data: GenerateWBSRequest,
-    http_request: Request
+    http_request: Request,
+    service: WBSService = Depends(get_wbs_service)
 ):
     """
     Generate a WBS diagram from a natural language prompt.
@@ -45,13 +47,13 @@ async def generate_wbs(
         - JSON response with base64-encoded image if Accept: application/json
     """
     logger.info(
-        f"Generate WBS request: format={request_data.format}, "
-        f"prompt='{request_data.prompt[:50]}...'"
+        "Generate WBS request: format=%s, "
+        "prompt='%.50s...'",
+        request_data.format,
+        request_data.prompt
     )
     
     try:
-        service = get_wbs_service()
-        
         # Generate WBS diagram
         image_bytes, plantuml_code = await service.generate_wbs(
             prompt=request_data.prompt,
@@ -77,8 +79,11 @@ async def generate_wbs(
                 media_type=mime_type
             )
             
+    except ValidationError:
+        # Rejected prompts are client errors, handled by the error middleware
+        raise
     except Exception as e:
-        logger.error(f"WBS generation failed: {e}")
+        logger.error("WBS generation failed: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to generate WBS diagram: {str(e)}"
@@ -88,7 +93,8 @@ async def generate_wbs(
 @router.post("/preview", tags=["WBS"])
 async def preview_wbs(
     request_data: PreviewWBSRequest,
-    http_request: Request
+    http_request: Request,
+    service: WBSService = Depends(get_wbs_service)
 ):
     """
     Preview/render a WBS diagram from PlantUML code directly (no LLM call).
@@ -99,11 +105,9 @@ async def preview_wbs(
         - Image response (image/svg+xml or image/png) by default
         - JSON response with base64-encoded image if Accept: application/json
     """
-    logger.info(f"Preview WBS request: format={request_data.format}")
+    logger.info("Preview WBS request: format=%s", request_data.format)
     
     try:
-        service = get_wbs_service()
-        
         # Preview WBS diagram (no LLM, no DB save)
         image_bytes = await service.preview_wbs(
             plantuml_code=request_data.plantuml_code,
@@ -130,7 +134,7 @@ async def preview_wbs(
             )
             
     except Exception as e:
-        logger.error(f"WBS preview failed: {e}")
+        logger.error("WBS preview failed: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to preview WBS diagram: {str(e)}"
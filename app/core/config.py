@@ -38,6 +38,10 @@ class Settings(BaseSettings):
         default=None,
         description="OpenAI model to use for diagram generation"
     )
+    OPENAI_FAST_MODEL: Optional[str] = Field(
+        default=None,
+        description="Optional cheaper/faster OpenAI model for short prompts"
+    )
     OPENAI_BASE_URL: Optional[str] = Field(
         default=None,
         description="Base URL for OpenAI API (can be changed for proxies)"
@@ -52,6 +56,10 @@ class Settings(BaseSettings):
         default=None,
         description="NVIDIA NIM model name"
     )
+    NVIDIA_FAST_MODEL: Optional[str] = Field(
+        default=None,
+        description="Optional cheaper/faster NVIDIA NIM model for short prompts"
+    )
     NVIDIA_BASE_URL: Optional[str] = Field(
         default=None,
         description="NVIDIA NIM API base URL"
@@ -66,6 +74,10 @@ class Settings(BaseSettings):
         default=None,
         description="Google Gemini model name"
     )
+    GEMINI_FAST_MODEL: Optional[str] = Field(
+        default=None,
+        description="Optional cheaper/faster Google Gemini model for short prompts"
+    )
     
     # Server Configuration
     HOST: str = Field(
@@ -98,18 +110,85 @@ class Settings(BaseSettings):
         le=100000,
         description="Maximum length of PlantUML code"
     )
+    MAX_MERMAID_LENGTH: int = Field(
+        default=50000,
+        ge=1,
+        le=100000,
+        description="Maximum length of Mermaid code"
+    )
     MAX_TOKENS: int = Field(
         default=1024,
         ge=1,
         le=4096,
         description="Maximum tokens for LLM response"
     )
+    LLM_CONTEXT_WINDOW: int = Field(
+        default=8192,
+        ge=1024,
+        description="Context window (tokens) assumed when pre-checking prompt size"
+    )
+    LLM_MAX_CONCURRENCY: int = Field(
+        default=10,
+        ge=1,
+        le=100,
+        description="Maximum number of concurrent LLM requests"
+    )
+    LLM_RAW_SDK: bool = Field(
+        default=False,
+        description="Call provider APIs directly instead of through LangChain"
+    )
+    LLM_FAST_PROMPT_MAX_CHARS: int = Field(
+        default=200,
+        ge=0,
+        description="Prompts shorter than this are routed to the fast model tier, if configured"
+    )
+    LLM_REQUESTS_PER_MINUTE: int = Field(
+        default=0,
+        ge=0,
+        description="Maximum LLM requests per minute across the process (0 disables)"
+    )
+    
+    # Graphviz Configuration
+    GRAPHVIZ_IN_PROCESS: bool = Field(
+        default=False,
+        description=(
+            "Render DOT in-process with pygraphviz (if installed) instead of spawning dot. "
+            "Avoids the process spawn per render but renders one diagram at a time, "
+            "so leave it off under concurrent load"
+        )
+    )
     
     # PlantUML Configuration
     PLANTUML_SERVER_URL: str = Field(
         default="https://www.plantuml.com/plantuml",
         description="PlantUML server URL for rendering diagrams"
     )
+    PLANTUML_USE_POST: bool = Field(
+        default=False,
+        description="POST the raw PlantUML source instead of encoding it into the URL"
+    )
+    
+    # Cache Configuration
+    RENDER_CACHE_MAX_ENTRIES: int = Field(
+        default=256,
+        ge=0,
+        description="Maximum number of rendered images kept in memory (0 disables)"
+    )
+    RENDER_CACHE_TTL_SECONDS: int = Field(
+        default=3600,
+        ge=0,
+        description="Seconds a rendered image stays cached (0 keeps it until evicted)"
+    )
+    LLM_CACHE_MAX_ENTRIES: int = Field(
+        default=512,
+        ge=0,
+        description="Maximum number of generated diagram codes kept in memory (0 disables)"
+    )
+    LLM_CACHE_TTL_SECONDS: int = Field(
+        default=86400,
+        ge=0,
+        description="Seconds a generated diagram code stays cached (0 keeps it until evicted)"
+    )
     
     # CORS Configuration
     CORS_ORIGINS: list[str] = Field(
@@ -129,6 +208,10 @@ class Settings(BaseSettings):
         default="INFO",
         description="Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)"
     )
+    LOG_FORMAT: Literal["text", "json"] = Field(
+        default="text",
+        description="Log output format: 'text' for humans or 'json' for log collectors"
+    )
     
     # Feature Flags
     DEBUG: bool = Field(
@@ -13,6 +13,8 @@ from fastapi.staticfiles import StaticFiles
 from app.core.config import settings
 from app.middleware.request_id import RequestIDMiddleware
 from app.middleware.error_handler import ErrorHandlerMiddleware
+from app.services.llm_service import get_llm_service
+from app.utils.http_client import close_http_client
 from app.utils.logger import setup_logging
 
 # Import all controllers
@@ -22,7 +24,7 @@ from app.controller.wbs_controller import router as wbs_router
 from app.controller.gantt_controller import router as gantt_router
 
 # Setup logging
-setup_logging(settings.LOG_LEVEL)
+setup_logging(settings.LOG_LEVEL, settings.LOG_FORMAT)
 logger = logging.getLogger(__name__)
 
 
@@ -33,18 +35,18 @@ async def lifespan(app: FastAPI):
     logger.info("=" * 60)
     logger.info("Starting Flowgen FastAPI Application")
     logger.info("=" * 60)
-    logger.info(f"Environment: {'DEBUG' if settings.DEBUG else 'PRODUCTION'}")
-    logger.info(f"LLM Provider: {settings.LLM_PROVIDER}")
+    logger.info("Environment: %s", 'DEBUG' if settings.DEBUG else 'PRODUCTION')
+    logger.info("LLM Provider: %s", settings.LLM_PROVIDER)
     
     # Log model based on provider
     if settings.LLM_PROVIDER == "openai" and settings.OPENAI_MODEL:
-        logger.info(f"LLM Model: {settings.OPENAI_MODEL}")
+        logger.info("LLM Model: %s", settings.OPENAI_MODEL)
     elif settings.LLM_PROVIDER == "nvidia" and settings.NVIDIA_MODEL:
-        logger.info(f"LLM Model: {settings.NVIDIA_MODEL}")
+        logger.info("LLM Model: %s", settings.NVIDIA_MODEL)
     elif settings.LLM_PROVIDER == "gemini" and settings.GEMINI_MODEL:
-        logger.info(f"LLM Model: {settings.GEMINI_MODEL}")
+        logger.info("LLM Model: %s", settings.GEMINI_MODEL)
     
-    logger.info(f"CORS Origins: {settings.CORS_ORIGINS}")
+    logger.info("CORS Origins: %s", settings.CORS_ORIGINS)
     logger.info("=" * 60)
     logger.info("Application started successfully")
     logger.info("=" * 60)
@@ -53,6 +55,9 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Flowgen...")
+    await close_http_client()
+    # The cached LLMService holds clients bound to the closed HTTP pool
+    get_llm_service.cache_clear()
     logger.info("✓ Application shutdown complete")
 
 
@@ -40,7 +40,7 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
             return response
             
         except ResourceNotFoundError as e:
-            logger.warning(f"Resource not found: {e.message}")
+            logger.warning("Resource not found: %s", e.message)
             return JSONResponse(
                 status_code=404,
                 content={
@@ -51,7 +51,7 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
             )
             
         except ValidationError as e:
-            logger.warning(f"Validation error: {e.message}")
+            logger.warning("Validation error: %s", e.message)
             return JSONResponse(
                 status_code=400,
                 content={
@@ -62,7 +62,7 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
             )
             
         except RateLimitError as e:
-            logger.warning(f"Rate limit exceeded: {e.message}")
+            logger.warning("Rate limit exceeded: %s", e.message)
             return JSONResponse(
                 status_code=429,
                 content={
@@ -73,7 +73,7 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
             )
             
         except FlowgenException as e:
-            logger.error(f"Application error: {e.message}")
+            logger.error("Application error: %s", e.message)
             return JSONResponse(
                 status_code=500,
                 content={
@@ -84,7 +84,7 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
             )
             
         except Exception as e:
-            logger.error(f"Unhandled exception: {e}", exc_info=True)
+            logger.error("Unhandled exception: %s", e, exc_info=True)
             return JSONResponse(
                 status_code=500,
                 content={
@@ -15,7 +15,7 @@ class GenerateGanttRequest(BaseModel):
     
     prompt: str = Field(
         ..., 
-        min_length=1, 
+        min_length=3, 
         max_length=2000,
         description="Natural language description of the project timeline and tasks"
     )
@@ -27,9 +27,11 @@ class GenerateGanttRequest(BaseModel):
     @field_validator("prompt")
     @classmethod
     def validate_prompt(cls, v: str) -> str:
-        """Validate prompt is not empty after stripping."""
+        """Validate prompt has at least 3 characters after stripping."""
         if not v.strip():
             raise ValueError("Prompt cannot be empty or whitespace only")
+        if len(v.strip()) < 3:
+            raise ValueError("Prompt must be at least 3 characters")
         return v.strip()
 
 
@@ -1,11 +1,12 @@
 """Service layer modules for business logic."""
 
-from app.services.llm_service import LLMService
+from app.services.llm_service import LLMService, get_llm_service
 from app.services.render_service import RenderService
 from app.services.diagram_service import DiagramService
 
 __all__ = [
     "LLMService",
+    "get_llm_service",
     "RenderService",
     "DiagramService",
 ]
@@ -5,12 +5,13 @@ Orchestrates the complete diagram generation workflow including:
 - LLM generation
 - Graphviz rendering
 """
-from typing import Tuple, Literal
-from datetime import datetime, timezone
+import io
+import time
+from typing import AsyncIterator, Tuple, Literal
 
 from app.core.config import settings
-from app.core.exceptions import DiagramGenerationError
-from app.services.llm_service import LLMService
+from app.core.exceptions import ConfigurationError, DiagramGenerationError, ValidationError
+from app.services.llm_service import get_llm_service
 from app.services.render_service import RenderService
 from app.utils.logger import get_logger
 
@@ -26,7 +27,7 @@ class DiagramService:
     
     def __init__(self):
         """Initialize service."""
-        self.llm_service = LLMService()
+        self.llm_service = get_llm_service()
         self.render_service = RenderService()
     
     async def generate_diagram(
@@ -52,11 +53,12 @@ class DiagramService:
             Tuple of (image_bytes, dot_code)
             
         Raises:
+            ValidationError: If the prompt is rejected before the LLM call
             DiagramGenerationError: If generation fails
         """
-        start_time = datetime.now(timezone.utc)
+        start_time = time.perf_counter()
         
-        logger.info(f"Generating diagram: prompt='{prompt[:50]}...', format={format}, layout={layout}")
+        logger.info("Generating diagram: prompt='%.50s...', format=%s, layout=%s", prompt, format, layout)
         
         # Step 1: Generate DOT code via LLM
         try:
@@ -65,10 +67,12 @@ class DiagramService:
                 max_tokens=settings.MAX_TOKENS
             )
             
-            logger.info(f"Generated DOT code ({len(dot_code)} characters)")
+            logger.info("Generated DOT code (%d characters)", len(dot_code))
             
+        except ValidationError:
+            raise
         except Exception as e:
-            logger.error(f"LLM generation failed: {e}")
+            logger.error("LLM generation failed: %s", e)
             raise DiagramGenerationError(
                 "Failed to generate diagram from prompt",
                 detail=str(e)
@@ -82,21 +86,24 @@ class DiagramService:
                 engine=layout
             )
             
-            logger.info(f"Rendered diagram ({len(image_bytes)} bytes)")
+            logger.info("Rendered diagram (%d bytes)", len(image_bytes))
             
         except Exception as e:
-            logger.error(f"Rendering failed: {e}")
+            logger.error("Rendering failed: %s", e)
             raise DiagramGenerationError(
                 "Failed to render diagram",
                 detail=str(e)
             )
         
         # Log success
-        total_time_ms = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
+        total_time_ms = int((time.perf_counter() - start_time) * 1000)
         
         logger.info(
-            f"Successfully generated diagram in {total_time_ms}ms "
-            f"(LLM: {llm_latency_ms}ms, tokens: {tokens_used})"
+            "Successfully generated diagram in %sms "
+            "(LLM: %sms, tokens: %s)",
+            total_time_ms,
+            llm_latency_ms,
+            tokens_used
         )
         
         return image_bytes, dot_code
@@ -121,7 +128,7 @@ class DiagramService:
         Raises:
             DiagramGenerationError: If rendering fails
         """
-        logger.info(f"Previewing diagram: format={format}, layout={layout}")
+        logger.info("Previewing diagram: format=%s, layout=%s", format, layout)
         
         try:
             image_bytes = await self.render_service.render_to_bytes(
@@ -130,13 +137,56 @@ class DiagramService:
                 engine=layout
             )
             
-            logger.info(f"Preview rendered ({len(image_bytes)} bytes)")
+            logger.info("Preview rendered (%d bytes)", len(image_bytes))
             return image_bytes
             
         except Exception as e:
-            logger.error(f"Preview rendering failed: {e}")
+            logger.error("Preview rendering failed: %s", e)
             raise DiagramGenerationError(
                 "Failed to preview diagram",
                 detail=str(e)
             )
-
+    
+    async def stream_dot_code(self, prompt: str) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Stream DOT code generation for a prompt.
+        
+        Yields ("token", chunk) for each piece of raw LLM output as it
+        arrives, then a single ("dot", dot_code) once the complete output
+        has been extracted and validated.
+        
+        Args:
+            prompt: Natural language description
+            
+        Yields:
+            Tuples of (event, data)
+            
+        Raises:
+            ValidationError: If the prompt is rejected before the LLM call
+            ConfigurationError: If the LLM provider is not initialized
+            DiagramGenerationError: If generation fails
+        """
+        logger.info("Streaming diagram: prompt='%.50s...'", prompt)
+        
+        buffer = io.StringIO()
+        try:
+            async for chunk in self.llm_service.stream_dot_code(
+                prompt=prompt,
+                max_tokens=settings.MAX_TOKENS
+            ):
+                buffer.write(chunk)
+                yield "token", chunk
+            
+            dot_code = self.llm_service.extract_code(buffer.getvalue(), "graphviz")
+            
+        except (ValidationError, ConfigurationError):
+            raise
+        except Exception as e:
+            logger.error("LLM streaming failed: %s", e)
+            raise DiagramGenerationError(
+                "Failed to generate diagram from prompt",
+                detail=str(e)
+            )
+        
+        logger.info("Streamed DOT code (%d characters)", len(dot_code))
+        yield "dot", dot_code
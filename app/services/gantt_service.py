@@ -5,17 +5,24 @@ Orchestrates the complete Gantt chart generation workflow including:
 - LLM generation of Mermaid Gantt code
 - Mermaid rendering to images
 """
+import time
 from typing import Tuple, Literal
-from datetime import datetime, timezone
 
 from app.core.config import settings
-from app.core.exceptions import DiagramGenerationError
-from app.services.llm_service import LLMService
+from app.core.exceptions import DiagramGenerationError, ValidationError
+from app.services.llm_service import get_llm_service
 from app.services.mermaid_service import MermaidService
+from app.utils.cache import LRUCache, cached_render
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Rendered images keyed by (format, Mermaid code), shared across service instances
+_render_cache: LRUCache[bytes] = LRUCache(
+    maxsize=settings.RENDER_CACHE_MAX_ENTRIES,
+    ttl=settings.RENDER_CACHE_TTL_SECONDS
+)
+
 
 class GanttService:
     """
@@ -26,7 +33,7 @@ class GanttService:
     
     def __init__(self):
         """Initialize service."""
-        self.llm_service = LLMService()
+        self.llm_service = get_llm_service()
         self.mermaid_service = MermaidService()
     
     async def generate_gantt(
@@ -50,11 +57,12 @@ class GanttService:
             Tuple of (image_bytes, mermaid_code)
             
         Raises:
+            ValidationError: If the prompt is rejected before the LLM call
             DiagramGenerationError: If generation fails
         """
-        start_time = datetime.now(timezone.utc)
+        start_time = time.perf_counter()
         
-        logger.info(f"Generating Gantt chart: prompt='{prompt[:50]}...', format={format}")
+        logger.info("Generating Gantt chart: prompt='%.50s...', format=%s", prompt, format)
         
         # Step 1: Generate Mermaid code via LLM
         try:
@@ -63,10 +71,12 @@ class GanttService:
                 max_tokens=settings.MAX_TOKENS
             )
             
-            logger.info(f"Generated Mermaid code ({len(mermaid_code)} characters)")
+            logger.info("Generated Mermaid code (%d characters)", len(mermaid_code))
             
+        except ValidationError:
+            raise
         except Exception as e:
-            logger.error(f"LLM generation failed: {e}")
+            logger.error("LLM generation failed: %s", e)
             raise DiagramGenerationError(
                 "Failed to generate Gantt chart from prompt",
                 detail=str(e)
@@ -74,26 +84,31 @@ class GanttService:
         
         # Step 2: Render Mermaid code to image
         try:
-            image_bytes = await self.mermaid_service.render_gantt_to_bytes(
-                mermaid_code=mermaid_code,
-                fmt=format
+            image_bytes = await cached_render(
+                _render_cache,
+                self.mermaid_service.render_gantt_to_bytes,
+                mermaid_code,
+                format
             )
             
-            logger.info(f"Rendered Gantt chart ({len(image_bytes)} bytes)")
+            logger.info("Rendered Gantt chart (%d bytes)", len(image_bytes))
             
         except Exception as e:
-            logger.error(f"Rendering failed: {e}")
+            logger.error("Rendering failed: %s", e)
             raise DiagramGenerationError(
                 "Failed to render Gantt chart",
                 detail=str(e)
             )
         
         # Log success
-        total_time_ms = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
+        total_time_ms = int((time.perf_counter() - start_time) * 1000)
         
         logger.info(
-            f"Successfully generated Gantt chart in {total_time_ms}ms "
-            f"(LLM: {llm_latency_ms}ms, tokens: {tokens_used})"
+            "Successfully generated Gantt chart in %sms "
+            "(LLM: %sms, tokens: %s)",
+            total_time_ms,
+            llm_latency_ms,
+            tokens_used
         )
         
         return image_bytes, mermaid_code
@@ -116,19 +131,21 @@ class GanttService:
         Raises:
             DiagramGenerationError: If rendering fails
         """
-        logger.info(f"Previewing Gantt chart: format={format}")
+        logger.info("Previewing Gantt chart: format=%s", format)
         
         try:
-            image_bytes = await self.mermaid_service.render_gantt_to_bytes(
-                mermaid_code=mermaid_code,
-                fmt=format
+            image_bytes = await cached_render(
+                _render_cache,
+                self.mermaid_service.render_gantt_to_bytes,
+                mermaid_code,
+                format
             )
             
-            logger.info(f"Preview rendered ({len(image_bytes)} bytes)")
+            logger.info("Preview rendered (%d bytes)", len(image_bytes))
             return image_bytes
             
         except Exception as e:
-            logger.error(f"Preview rendering failed: {e}")
+            logger.error("Preview rendering failed: %s", e)
             raise DiagramGenerationError(
                 "Failed to preview Gantt chart",
                 detail=str(e)
@@ -0,0 +1,157 @@
+"""
+Raw LLM Backends - Direct Provider SDK Calls
+
+Lightweight alternatives to the LangChain chat models for the generation
+hot path, enabled with LLM_RAW_SDK. Each backend exposes the same
+generate(system, user, max_tokens) coroutine and reuses the shared
+HTTP client's connection pool.
+"""
+from typing import Optional, Protocol, Tuple
+
+from app.core.config import settings
+from app.utils.http_client import get_http_client
+
+
+class RawBackend(Protocol):
+    """Interface shared by the raw provider backends."""
+
+    model: str
+
+    async def generate(
+        self,
+        system: str,
+        user: str,
+        max_tokens: int
+    ) -> Tuple[str, Optional[int]]:
+        ...
+
+
+class RawOpenAIBackend:
+    """Chat completions through the OpenAI SDK."""
+
+    def __init__(self, api_key: str, model: str, base_url: Optional[str] = None):
+        from openai import AsyncOpenAI
+
+        self.model = model
+        # Retries are handled by LLMService, so the SDK must not retry too
+        self._client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=30,
+            max_retries=0,
+            http_client=get_http_client()
+        )
+
+    async def generate(
+        self,
+        system: str,
+        user: str,
+        max_tokens: int
+    ) -> Tuple[str, Optional[int]]:
+        """
+        Generate a completion for a system and user prompt.
+
+        Args:
+            system: System prompt
+            user: User prompt
+            max_tokens: Maximum tokens for response
+
+        Returns:
+            Tuple of (response_text, tokens_used)
+        """
+        response = await self._client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user}
+            ],
+            temperature=0.3,
+            max_tokens=max_tokens
+        )
+        content = response.choices[0].message.content if response.choices else None
+        tokens_used = response.usage.total_tokens if response.usage else None
+        return content or "", tokens_used
+
+
+class RawNVIDIABackend(RawOpenAIBackend):
+    """NVIDIA NIM through its OpenAI-compatible endpoint."""
+
+    DEFAULT_BASE_URL = "https://integrate.api.nvidia.com/v1"
+
+    def __init__(self, api_key: str, model: str, base_url: Optional[str] = None):
+        super().__init__(api_key, model, base_url or self.DEFAULT_BASE_URL)
+
+
+class RawGeminiBackend:
+    """Google Gemini through the generateContent REST API."""
+
+    BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+    def __init__(self, api_key: str, model: str):
+        self.model = model
+        self._api_key = api_key
+
+    async def generate(
+        self,
+        system: str,
+        user: str,
+        max_tokens: int
+    ) -> Tuple[str, Optional[int]]:
+        """
+        Generate a completion for a system and user prompt.
+
+        Args:
+            system: System prompt
+            user: User prompt
+            max_tokens: Maximum tokens for response
+
+        Returns:
+            Tuple of (response_text, tokens_used)
+
+        Raises:
+            httpx.HTTPStatusError: If the API returns an error status
+        """
+        response = await get_http_client().post(
+            f"{self.BASE_URL}/models/{self.model}:generateContent",
+            headers={"x-goog-api-key": self._api_key},
+            json={
+                "systemInstruction": {"parts": [{"text": system}]},
+                "contents": [{"role": "user", "parts": [{"text": user}]}],
+                "generationConfig": {"temperature": 0.3, "maxOutputTokens": max_tokens}
+            },
+            timeout=30.0
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        candidates = data.get("candidates") or [{}]
+        parts = candidates[0].get("content", {}).get("parts", [])
+        content = "".join(part.get("text", "") for part in parts)
+        tokens_used = data.get("usageMetadata", {}).get("totalTokenCount")
+        return content, tokens_used
+
+
+def create_raw_backend(provider: str, fast: bool = False) -> Optional[RawBackend]:
+    """
+    Build the raw backend for a provider from settings.
+
+    Args:
+        provider: LLM provider name
+        fast: Use the provider's fast model tier instead of the primary model
+
+    Returns:
+        Configured backend, or None if the provider is not fully configured
+    """
+    if provider == "openai" and settings.OPENAI_API_KEY:
+        model = settings.OPENAI_FAST_MODEL if fast else settings.OPENAI_MODEL
+        if model:
+            return RawOpenAIBackend(settings.OPENAI_API_KEY, model, settings.OPENAI_BASE_URL)
+    elif provider == "nvidia" and settings.NVIDIA_API_KEY:
+        model = settings.NVIDIA_FAST_MODEL if fast else settings.NVIDIA_MODEL
+        if model:
+            return RawNVIDIABackend(settings.NVIDIA_API_KEY, model, settings.NVIDIA_BASE_URL)
+    elif provider == "gemini" and settings.GOOGLE_API_KEY:
+        model = settings.GEMINI_FAST_MODEL if fast else settings.GEMINI_MODEL
+        if model:
+            return RawGeminiBackend(settings.GOOGLE_API_KEY, model)
+    return None
@@ -7,24 +7,249 @@ Uses LangChain for provider abstraction (OpenAI, NVIDIA NIM).
 """
 import re
 import asyncio
-from typing import Optional, Tuple
-from datetime import datetime, timezone
+import functools
+import importlib
+import time
+from types import MappingProxyType
+from typing import AsyncIterator, Dict, List, Literal, Optional, Tuple, Type, Union
 
+import httpx
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.language_models.chat_models import BaseChatModel
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
 from app.core.config import settings
-from app.core.exceptions import LLMError
+from app.core.exceptions import ConfigurationError, LLMError, ValidationError
+from app.services.llm_backends import RawBackend, create_raw_backend
+from app.utils.cache import LRUCache, make_cache_key
+from app.utils.http_client import get_http_client
 from app.utils.logger import get_logger
+from app.utils.rate_limiter import AsyncRateLimiter
 
 logger = get_logger(__name__)
 
+# Extracted diagram code keyed by (prompt kind, user prompt, max_tokens),
+# shared across service instances so identical prompts skip the LLM round-trip.
+# System prompts are immutable for the process lifetime, so the kind stands in
+# for the multi-KB prompt text and keeps key hashing cheap.
+_response_cache: LRUCache[str] = LRUCache(
+    maxsize=settings.LLM_CACHE_MAX_ENTRIES,
+    ttl=settings.LLM_CACHE_TTL_SECONDS
+)
+
+# Generations currently running, keyed like the response cache, so concurrent
+# identical requests await one LLM call instead of each starting their own
+_inflight: Dict[bytes, "asyncio.Future[Tuple[str, Optional[int]]]"] = {}
+
+# Process-wide backpressure: cap in-flight LLM requests and pace them to the
+# provider's request quota so callers wait instead of collecting 429s
+_llm_semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+_llm_rate_limiter = AsyncRateLimiter(settings.LLM_REQUESTS_PER_MINUTE, time_period=60.0)
+
+# Code fence and declaration patterns used by the extractors
+_DOT_FENCE_RE = re.compile(r"```(?:dot|graphviz)?\s*\n(.*?)\n```", re.DOTALL)
+_PLANTUML_FENCE_RE = re.compile(r"```(?:plantuml)?\s*\n(.*?)\n```", re.DOTALL)
+_MERMAID_FENCE_RE = re.compile(r"```(?:mermaid)?\s*\n(.*?)\n```", re.DOTALL)
+_DOT_KEYWORD_RE = re.compile(r"\b(di)?graph\b", re.IGNORECASE)
+_GANTT_KEYWORD_RE = re.compile(r"\bgantt\b", re.IGNORECASE)
+
+# Structural pre-checks for extracted code: malformed LLM output is rejected
+# (and retried) here instead of failing later inside the much slower renderers.
+# DOT keywords are case-insensitive and comments may surround the graph.
+_DOT_COMMENTS = r"(?:\s|//[^\n]*|/\*.*?\*/|#[^\n]*)*"
+_DOT_STRUCTURE_RE = re.compile(
+    rf"^{_DOT_COMMENTS}(?:strict\s+)?(?:di)?graph\b[^{{]*\{{.*\}}{_DOT_COMMENTS}$",
+    re.DOTALL | re.IGNORECASE
+)
+_GANTT_STRUCTURE_RE = re.compile(
+    r"^\s*gantt\b.*?^\s*dateFormat\b.*?^\s*section\b",
+    re.DOTALL | re.MULTILINE
+)
+
+
+# Fallback diagrams served when no LLM provider is configured
+_DIRECTED_KEYWORDS = ("flow", "process", "step", "sequence", "hierarchy")
+_FALLBACK_DOT_DIRECTED = """digraph example {
+    rankdir=TB;
+    node [shape=box, style=rounded];
+    
+    start [label="Start", shape=ellipse];
+    step1 [label="Process Step"];
+    step2 [label="Decision", shape=diamond];
+    end [label="End", shape=ellipse];
+    
+    start -> step1;
+    step1 -> step2;
+    step2 -> end [label="Complete"];
+}"""
+_FALLBACK_DOT_UNDIRECTED = """graph example {
+    node [shape=circle];
+    
+    A [label="Node A"];
+    B [label="Node B"];
+    C [label="Node C"];
+    D [label="Node D"];
+    
+    A -- B;
+    B -- C;
+    C -- D;
+    D -- A;
+    A -- C;
+}"""
+_FALLBACK_WBS_TEMPLATE = """@startwbs
+* {project_name}
+** Planning Phase
+*** Requirements Gathering
+*** Resource Allocation
+** Execution Phase
+*** Task Development
+*** Quality Assurance
+** Completion Phase
+*** Testing
+*** Deployment
+@endwbs"""
+_FALLBACK_GANTT_TEMPLATE = """gantt
+    title {project_name}
+    dateFormat YYYY-MM-DD
+    axisFormat %b %d
+    
+    section Planning
+    Requirements :done, req, 2025-01-01, 5d
+    Design :active, design, after req, 7d
+    
+    section Development
+    Backend :dev1, after design, 10d
+    Frontend :dev2, after design, 8d
+    
+    section Testing
+    QA Testing :crit, test, after dev1 dev2, 5d
+    
+    section Deployment
+    Deploy :milestone, after test, 0d"""
+
+
+def _fallback_project_name(prompt: str) -> str:
+    """Derive a title for the fallback diagrams from the first prompt words."""
+    words = prompt.split(None, 3)[:3]
+    return " ".join(words).title() if words else "Example Project"
+
+
+def _load_transient_errors() -> Tuple[type, ...]:
+    """Collect exception types that signal a transient provider failure."""
+    errors: List[type] = [TimeoutError, ConnectionError, httpx.TimeoutException, httpx.NetworkError]
+    try:
+        import openai
+        errors += [
+            openai.RateLimitError,
+            openai.APITimeoutError,
+            openai.APIConnectionError,
+            openai.InternalServerError,
+        ]
+    except ImportError:
+        pass
+    try:
+        from google.api_core import exceptions as google_exceptions
+        errors += [
+            google_exceptions.ResourceExhausted,
+            google_exceptions.ServiceUnavailable,
+            google_exceptions.DeadlineExceeded,
+        ]
+    except ImportError:
+        pass
+    return tuple(errors)
+
+
+_TRANSIENT_ERRORS = _load_transient_errors()
+
+# Providers without typed errors (e.g. NVIDIA NIM) report "[429] ..." style messages
+_TRANSIENT_STATUS_RE = re.compile(r"\[(?:408|429|5\d\d)\]")
+
+
+# LangChain chat model module, class, pip package and display name per provider
+_PROVIDER_MODELS = {
+    "openai": ("langchain_openai", "ChatOpenAI", "langchain-openai", "OpenAI"),
+    "nvidia": ("langchain_nvidia_ai_endpoints", "ChatNVIDIA", "langchain-nvidia-ai-endpoints", "NVIDIA NIM"),
+    "gemini": ("langchain_google_genai", "ChatGoogleGenerativeAI", "langchain-google-genai", "Google Gemini"),
+}
+
+
+@functools.cache
+def _load_chat_model_class(provider: str) -> Optional[Type[BaseChatModel]]:
+    """
+    Import the selected provider's chat model class once per process.
+    
+    Only the configured provider's SDK is imported; a failed import is
+    logged once and cached as None.
+    """
+    module_name, class_name, package, _ = _PROVIDER_MODELS[provider]
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        logger.warning(
+            "Failed to import %s: %s. Install with: pip install %s",
+            module_name,
+            e,
+            package
+        )
+        return None
+    return getattr(module, class_name)
+
+
+def _part_to_str(part) -> str:
+    """Text of one LangChain content part (plain string or typed dict block)."""
+    if isinstance(part, str):
+        return part
+    if isinstance(part, dict):
+        return str(part.get("text") or part.get("content") or "")
+    return ""
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) without a tokenizer."""
+    return len(text) // 4 + 1
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """
+    Decide whether a failed generation attempt is worth retrying.
+    
+    LLMErrors raised without an underlying cause come from empty or malformed
+    output and are retried; wrapped provider errors are retried only when they
+    are transient (rate limits, timeouts, connection failures, 5xx).
+    """
+    if isinstance(exc, LLMError):
+        if exc.__cause__ is None:
+            return True
+        exc = exc.__cause__
+    if isinstance(exc, _TRANSIENT_ERRORS):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status in (408, 429) or status >= 500
+    return bool(_TRANSIENT_STATUS_RE.search(str(exc)))
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    """Log a failed attempt before tenacity sleeps and retries."""
+    logger.warning(
+        "LLM call failed (attempt %d): %s. Retrying in %.1fs...",
+        retry_state.attempt_number,
+        retry_state.outcome.exception(),
+        retry_state.next_action.sleep
+    )
+
 
 class LLMService:
     """Service class for LLM interactions to generate diagram code."""
     
-    # System prompts for different diagram types
-    SYSTEM_PROMPTS = {
+    # System prompts for different diagram types (read-only)
+    SYSTEM_PROMPTS = MappingProxyType({
         "graphviz": """You are a specialized assistant that converts natural-language descriptions into Graphviz DOT code.
 
 RULES:
@@ -88,7 +313,45 @@ Example:
 
 Generate ONLY the PlantUML WBS code, no explanations or commentary.""",
 
-        "mermaid_gantt": """You are an expert at creating Gantt charts using Mermaid syntax based on the official Mermaid.js documentation.
+        "mermaid_gantt": """You are an expert at creating Gantt charts using Mermaid syntax.
+
+Generate valid Mermaid Gantt code following this grammar:
+
+gantt
+    title <optional title>
+    dateFormat YYYY-MM-DD
+    axisFormat <optional, e.g. %b %d>
+    excludes <optional: weekends | YYYY-MM-DD, ... | weekday names>
+    section <Section Name>
+    <Task Name> :[tags,] [taskId,] <start>, <end>
+
+- tags (optional, first): done, active, crit, milestone; combine as 'crit, active'
+- taskId: alphanumeric identifier, referenced by dependencies
+- start: a date in dateFormat, or 'after id1 [id2 ...]'; omitted = after previous task
+- end: a date, a duration (3d, 2w, 24h), or 'until taskId'
+- milestones use the milestone tag and 0d duration
+- comments use %% on their own line
+
+Example:
+gantt
+    title Website Launch
+    dateFormat YYYY-MM-DD
+    excludes weekends
+    section Build
+    Design :done, des, 2024-01-01, 5d
+    Develop :crit, active, dev, after des, 10d
+    section Release
+    Test :test, after dev, 4d
+    Launch :milestone, after test, 0d
+
+Rules:
+1. Start with 'gantt' on the first line and always set dateFormat
+2. Every task belongs to a section; one task per line, indented 4 spaces
+3. Dates must match dateFormat; use consistent formats throughout
+
+Output ONLY the Mermaid Gantt code. No explanations, no commentary, no code fences.""",
+        # Full syntax reference, used only to retry after malformed output
+        "mermaid_gantt_reference": """You are an expert at creating Gantt charts using Mermaid syntax based on the official Mermaid.js documentation.
 
 Generate valid Mermaid Gantt chart syntax that follows these exact specifications:
 
@@ -276,82 +539,120 @@ gantt
 12. Use consistent date formats throughout
 
 Generate ONLY the Mermaid Gantt code based on the user's description. No explanations, no commentary, just valid Mermaid syntax."""
+    })
+    
+    # Extractor, fallback generator and log label for each system prompt key
+    _KINDS = {
+        "graphviz": ("_extract_dot", "_fallback_mock", "DOT code"),
+        "plantuml_wbs": ("_extract_plantuml", "_fallback_mock_wbs", "PlantUML WBS code"),
+        "mermaid_gantt": ("_extract_mermaid", "_fallback_mock_gantt", "Mermaid Gantt code"),
+    }
+    
+    # Longer system prompt to switch to when a kind's output fails extraction
+    _REFERENCE_PROMPTS = {
+        "mermaid_gantt": "mermaid_gantt_reference",
+    }
+    
+    # Kinds simple enough to try on the fast model tier for short prompts
+    _FAST_KINDS = frozenset({"graphviz", "plantuml_wbs"})
+    
+    # Constant system prompt sizes used by the pre-call size check
+    _SYSTEM_PROMPT_TOKENS = {
+        kind: _estimate_tokens(text) for kind, text in SYSTEM_PROMPTS.items()
+    }
+    
+    # System messages are built once and shared by every call instead of
+    # re-wrapping the multi-KB prompt strings per request
+    _SYSTEM_MESSAGES = {
+        kind: SystemMessage(content=text) for kind, text in SYSTEM_PROMPTS.items()
     }
     
     def __init__(self):
         self.provider = settings.LLM_PROVIDER
         self.llm: Optional[BaseChatModel] = None
-        self._use_llm = False
+        self.llm_fast: Optional[BaseChatModel] = None
+        self.backend: Optional[RawBackend] = None
+        self.backend_fast: Optional[RawBackend] = None
         self._use_llm = False
         
         # Initialize LLM based on provider
-        if self.provider == "openai" and settings.OPENAI_API_KEY and settings.OPENAI_MODEL:
-            try:
-                from langchain_openai import ChatOpenAI
-                init_params = {
-                    "api_key": settings.OPENAI_API_KEY,
-                    "model": settings.OPENAI_MODEL,
-                    "temperature": 0.3,
-                    "max_tokens": settings.MAX_TOKENS,
-                    "timeout": 30
-                }
-                if settings.OPENAI_BASE_URL:
-                    init_params["base_url"] = settings.OPENAI_BASE_URL
-                
-                self.llm = ChatOpenAI(**init_params)
-                self._use_llm = True
-                logger.info(f"Initialized LangChain with OpenAI: {settings.OPENAI_MODEL}")
-            except ImportError as e:
-                logger.warning(
-                    f"Failed to import langchain_openai: {e}. "
-                    "Install with: pip install langchain-openai"
-                )
+        raw_backend = create_raw_backend(self.provider) if settings.LLM_RAW_SDK else None
+        if raw_backend is not None:
+            self.backend = raw_backend
+            self.backend_fast = create_raw_backend(self.provider, fast=True)
+            self._use_llm = True
+            logger.info("Initialized raw %s SDK backend: %s", self.provider, raw_backend.model)
+        
+        elif self.provider == "openai" and settings.OPENAI_API_KEY and settings.OPENAI_MODEL:
+            init_params = {
+                "api_key": settings.OPENAI_API_KEY,
+                "model": settings.OPENAI_MODEL,
+                "temperature": 0.3,
+                "max_tokens": settings.MAX_TOKENS,
+                "timeout": 30,
+                # Share one connection pool across per-request instances
+                "http_async_client": get_http_client()
+            }
+            if settings.OPENAI_BASE_URL:
+                init_params["base_url"] = settings.OPENAI_BASE_URL
+            self._init_chat_models(init_params, settings.OPENAI_FAST_MODEL)
         
         elif self.provider == "nvidia" and settings.NVIDIA_API_KEY and settings.NVIDIA_MODEL:
-            try:
-                from langchain_nvidia_ai_endpoints import ChatNVIDIA
-                init_params = {
-                    "api_key": settings.NVIDIA_API_KEY,
-                    "model": settings.NVIDIA_MODEL,
-                    "temperature": 0.3,
-                    "max_tokens": settings.MAX_TOKENS,
-                    "timeout": 30
-                }
-                if settings.NVIDIA_BASE_URL:
-                    init_params["base_url"] = settings.NVIDIA_BASE_URL
-                
-                self.llm = ChatNVIDIA(**init_params)
-                self._use_llm = True
-                logger.info(f"Initialized LangChain with NVIDIA NIM: {settings.NVIDIA_MODEL}")
-            except ImportError as e:
-                logger.warning(
-                    f"Failed to import langchain_nvidia_ai_endpoints: {e}. "
-                    "Install with: pip install langchain-nvidia-ai-endpoints"
-                )
+            init_params = {
+                "api_key": settings.NVIDIA_API_KEY,
+                "model": settings.NVIDIA_MODEL,
+                "temperature": 0.3,
+                "max_tokens": settings.MAX_TOKENS,
+                "timeout": 30
+            }
+            if settings.NVIDIA_BASE_URL:
+                init_params["base_url"] = settings.NVIDIA_BASE_URL
+            self._init_chat_models(init_params, settings.NVIDIA_FAST_MODEL)
         
         elif self.provider == "gemini" and settings.GOOGLE_API_KEY and settings.GEMINI_MODEL:
-            try:
-                from langchain_google_genai import ChatGoogleGenerativeAI
-                self.llm = ChatGoogleGenerativeAI(
-                    google_api_key=settings.GOOGLE_API_KEY,
-                    model=settings.GEMINI_MODEL,
-                    temperature=0.3,
-                    max_tokens=settings.MAX_TOKENS,
-                    timeout=30
-                )
-                self._use_llm = True
-                logger.info(f"Initialized LangChain with Google Gemini: {settings.GEMINI_MODEL}")
-            except ImportError as e:
-                logger.warning(
-                    f"Failed to import langchain_google_genai: {e}. "
-                    "Install with: pip install langchain-google-genai"
-                )
+            init_params = {
+                "google_api_key": settings.GOOGLE_API_KEY,
+                "model": settings.GEMINI_MODEL,
+                "temperature": 0.3,
+                "max_tokens": settings.MAX_TOKENS,
+                "timeout": 30
+            }
+            self._init_chat_models(init_params, settings.GEMINI_FAST_MODEL)
         
         if not self._use_llm:
             logger.warning(
-                f"No valid configuration for provider '{self.provider}'. Using fallback mock implementation."
+                "No valid configuration for provider '%s'. Using fallback mock implementation.",
+                self.provider
             )
     
+    def _init_chat_models(self, init_params: dict, fast_model: Optional[str]) -> None:
+        """
+        Build the provider's primary (and optional fast) LangChain chat model.
+        
+        Args:
+            init_params: Constructor arguments for the primary model
+            fast_model: Optional model name for the fast tier
+        """
+        chat_model_class = _load_chat_model_class(self.provider)
+        if chat_model_class is None:
+            return
+        
+        # Releases without an http_async_client field would pass it on to the
+        # completions API as a model kwarg, failing every call
+        fields = getattr(chat_model_class, "model_fields", None) or getattr(chat_model_class, "__fields__", {})
+        if "http_async_client" in init_params and "http_async_client" not in fields:
+            init_params = {k: v for k, v in init_params.items() if k != "http_async_client"}
+        
+        self.llm = chat_model_class(**init_params)
+        if fast_model:
+            self.llm_fast = chat_model_class(**{**init_params, "model": fast_model})
+        self._use_llm = True
+        logger.info(
+            "Initialized LangChain with %s: %s",
+            _PROVIDER_MODELS[self.provider][3],
+            init_params['model']
+        )
+    
     async def generate_dot_code(
         self,
         prompt: str,
@@ -372,59 +673,175 @@ Generate ONLY the Mermaid Gantt code based on the user's description. No explana
         Raises:
             LLMError: If LLM call fails after retries
         """
-        start_time = datetime.now(timezone.utc)
+        return await self._generate(prompt, "graphviz", max_tokens, max_retries)
+    
+    async def _generate(
+        self,
+        prompt: str,
+        kind: str,
+        max_tokens: int,
+        max_retries: int
+    ) -> Tuple[str, Optional[int], int]:
+        """
+        Generate diagram code of the given kind with caching and retries.
+        
+        Args:
+            prompt: Natural language description of the diagram
+            kind: System prompt key ("graphviz", "plantuml_wbs", "mermaid_gantt")
+            max_tokens: Maximum tokens for LLM response
+            max_retries: Number of retry attempts on transient errors
+            
+        Returns:
+            Tuple of (code, tokens_used, latency_ms)
+            
+        Raises:
+            ValidationError: If the prompt is obviously invalid
+            LLMError: If LLM call fails after retries
+        """
+        self._validate_prompt(prompt, kind, max_tokens)
+        _, fallback_name, label = self._KINDS[kind]
+        start_time = time.perf_counter()
         
         if not self._use_llm:
-            dot_code = self._fallback_mock(prompt)
-            latency_ms = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
-            return dot_code, None, latency_ms
+            code = getattr(self, fallback_name)(prompt)
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
+            return code, None, latency_ms
         
-        # Try with retries and exponential backoff
-        for attempt in range(max_retries):
-            try:
-                response, tokens_used = await self._call_llm_with_prompt(
-                    prompt=prompt,
-                    max_tokens=max_tokens,
-                    system_prompt=self.SYSTEM_PROMPTS["graphviz"]
-                )
-                dot_code = self._extract_dot(response)
-                latency_ms = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
-                
-                logger.info(
-                    f"Successfully generated DOT code "
-                    f"(tokens: {tokens_used}, latency: {latency_ms}ms)"
-                )
-                
-                return dot_code, tokens_used, latency_ms
-                
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
-                    logger.warning(
-                        f"LLM call failed (attempt {attempt + 1}/{max_retries}): {e}. "
-                        f"Retrying in {wait_time}s..."
-                    )
-                    await asyncio.sleep(wait_time)
-                else:
-                    latency_ms = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
-                    logger.error(f"LLM call failed after {max_retries} attempts: {e}")
-                    raise LLMError(
-                        f"Failed to generate DOT code after {max_retries} attempts",
-                        detail=str(e)
+        cache_key = make_cache_key(kind, prompt, str(max_tokens))
+        cached_code = _response_cache.get(cache_key)
+        if cached_code is not None:
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
+            logger.info("Returning cached %s", label)
+            return cached_code, None, latency_ms
+        
+        task = _inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._generate_with_retries(prompt, kind, max_tokens, max_retries, cache_key)
+            )
+            _inflight[cache_key] = task
+            task.add_done_callback(lambda _: _inflight.pop(cache_key, None))
+        else:
+            logger.info("Joining in-flight generation of %s", label)
+        
+        # Shielded so one caller's cancellation does not abort the shared call
+        code, tokens_used = await asyncio.shield(task)
+        latency_ms = int((time.perf_counter() - start_time) * 1000)
+        
+        logger.info(
+            "Successfully generated %s (tokens: %s, latency: %dms)",
+            label,
+            tokens_used,
+            latency_ms
+        )
+        
+        return code, tokens_used, latency_ms
+    
+    async def _generate_with_retries(
+        self,
+        prompt: str,
+        kind: str,
+        max_tokens: int,
+        max_retries: int,
+        cache_key: bytes
+    ) -> Tuple[str, Optional[int]]:
+        """
+        Call the LLM and extract code, retrying failures, and cache the result.
+        
+        Args:
+            prompt: Natural language description of the diagram
+            kind: System prompt key
+            max_tokens: Maximum tokens for LLM response
+            max_retries: Number of retry attempts on transient errors
+            cache_key: Response cache key for this request
+            
+        Returns:
+            Tuple of (code, tokens_used)
+            
+        Raises:
+            LLMError: If LLM call fails after retries
+        """
+        extractor_name, _, label = self._KINDS[kind]
+        extract = getattr(self, extractor_name)
+        
+        # Retry malformed output and transient provider errors with jittered
+        # exponential backoff; permanent errors (auth, bad request) fail fast
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(max_retries),
+            wait=wait_exponential_jitter(initial=1, max=60),
+            retry=retry_if_exception(_is_retryable),
+            before_sleep=_log_retry,
+            reraise=True
+        )
+        attempt_number = 0
+        prompt_kind = kind
+        escalate = False
+        try:
+            async for attempt in retrying:
+                with attempt:
+                    attempt_number = attempt.retry_state.attempt_number
+                    response, tokens_used = await self._call_llm_with_prompt(
+                        prompt=prompt,
+                        max_tokens=max_tokens,
+                        kind=prompt_kind,
+                        escalate=escalate
                     )
+                    try:
+                        code = extract(response)
+                    except LLMError:
+                        # Retry malformed output with the full syntax reference
+                        # on the primary model
+                        prompt_kind = self._REFERENCE_PROMPTS.get(kind, kind)
+                        escalate = True
+                        raise
+        except Exception as e:
+            logger.error("LLM call failed after %s attempt(s): %s", attempt_number, e)
+            raise LLMError(
+                f"Failed to generate {label} after {attempt_number} attempt(s)",
+                detail=str(e)
+            )
         
-        # Defensive: should not be reachable because the loop either returns or raises;
-        # add an explicit raise to satisfy static type checkers that a Tuple is always returned or an exception raised.
-        raise LLMError(
-            "LLM generation ended unexpectedly: no result produced",
-            detail="Internal error in generate_dot_code control flow"
+        _response_cache.set(cache_key, code)
+        return code, tokens_used
+    
+    def _validate_prompt(self, prompt: str, kind: str, max_tokens: int) -> None:
+        """
+        Reject prompts that cannot produce a useful response before calling the LLM.
+        
+        Args:
+            prompt: User prompt
+            kind: System prompt key
+            max_tokens: Maximum tokens for response
+            
+        Raises:
+            ValidationError: If the prompt is too short or too long
+        """
+        if len(prompt.strip()) < 3:
+            raise ValidationError("Prompt is too short", detail="Describe the diagram in at least 3 characters")
+        if len(prompt) > settings.MAX_PROMPT_LENGTH:
+            raise ValidationError(
+                "Prompt too long",
+                detail=f"{len(prompt)} characters exceeds the limit of {settings.MAX_PROMPT_LENGTH}"
+            )
+        # Size for the largest system prompt a retry can escalate to, so a
+        # prompt that fits the first attempt cannot overflow on the retry
+        system_tokens = max(
+            self._SYSTEM_PROMPT_TOKENS[kind],
+            self._SYSTEM_PROMPT_TOKENS[self._REFERENCE_PROMPTS.get(kind, kind)]
         )
+        estimated_tokens = system_tokens + _estimate_tokens(prompt) + max_tokens
+        if estimated_tokens > settings.LLM_CONTEXT_WINDOW:
+            raise ValidationError(
+                "Prompt too long",
+                detail=f"~{estimated_tokens} tokens exceeds the context window of {settings.LLM_CONTEXT_WINDOW}"
+            )
     
     async def _call_llm_with_prompt(
         self,
         prompt: str,
         max_tokens: int,
-        system_prompt: str
+        kind: str,
+        escalate: bool = False
     ) -> Tuple[str, Optional[int]]:
         """
         Generic method to call LLM API asynchronously with a specific system prompt.
@@ -432,52 +849,260 @@ Generate ONLY the Mermaid Gantt code based on the user's description. No explana
         Args:
             prompt: User prompt
             max_tokens: Maximum tokens for response
-            system_prompt: System prompt to use for this generation
+            kind: System prompt key selecting the prebuilt system message
+            escalate: Skip the fast model tier and use the primary model
             
         Returns:
             Tuple of (response_text, tokens_used)
         """
+        if self.llm is None and self.backend is None:
+            raise ConfigurationError("LLM is not initialized; check provider configuration")
+        
         try:
+            model = self._pick_llm(prompt, kind, escalate)
+            
+            if self.backend is not None:
+                # Raw SDK path skips LangChain message handling entirely
+                async with _llm_semaphore, _llm_rate_limiter:
+                    content, tokens_used = await model.generate(
+                        self.SYSTEM_PROMPTS[kind], prompt, max_tokens
+                    )
+                content = content.strip()
+                if not content:
+                    raise LLMError("Empty response from LLM")
+                return content, tokens_used
+            
             # Prepare messages
-            messages = [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=prompt)
-            ]
+            messages = [self._SYSTEM_MESSAGES[kind], HumanMessage(content=prompt)]
             # Call LLM using LangChain's async invoke
-            if self.llm is None:
-                raise LLMError("LLM is not initialized; check provider configuration")
-            response = await self.llm.ainvoke(messages)
-            
-            content = response.content
-            if not content:
-                raise LLMError("Empty response from LLM")
-            # Normalize content to a string (LangChain may return list/dict parts)
-            if isinstance(content, list):
-                normalized_parts = []
-                for part in content:
-                    if isinstance(part, str):
-                        normalized_parts.append(part)
-                    elif isinstance(part, dict):
-                        text_val = part.get("text") or part.get("content") or ""
-                        if text_val:
-                            normalized_parts.append(str(text_val))
-                content = "".join(normalized_parts).strip()
-            else:
-                content = str(content).strip()
-            if not content:
-                raise LLMError("Empty response from LLM after normalization")
-            
-            # Extract token usage from response metadata
-            tokens_used = None
-            if hasattr(response, 'response_metadata'):
-                usage = response.response_metadata.get('token_usage', {})
-                tokens_used = usage.get('total_tokens')
-            
-            return content, tokens_used
+            async with _llm_semaphore, _llm_rate_limiter:
+                response = await model.ainvoke(messages)
             
+            return self._parse_response(response)
+            
+        except LLMError:
+            raise
         except Exception as e:
-            logger.error(f"LLM API error ({self.provider}): {e}")
-            raise LLMError(f"LLM API call failed: {str(e)}")
+            logger.error("LLM API error (%s): %s", self.provider, e)
+            raise LLMError(f"LLM API call failed: {str(e)}") from e
+    
+    def _pick_llm(
+        self,
+        prompt: str,
+        kind: str,
+        escalate: bool = False
+    ) -> Union[BaseChatModel, RawBackend]:
+        """
+        Choose the model tier for a prompt.
+        
+        Short prompts for simple diagram kinds go to the fast model when one
+        is configured; everything else uses the primary model.
+        
+        Args:
+            prompt: User prompt
+            kind: System prompt key
+            escalate: Always use the primary model
+            
+        Returns:
+            Raw backend when LLM_RAW_SDK is active, otherwise the chat model
+        """
+        if self.backend is not None:
+            primary, fast = self.backend, self.backend_fast
+        else:
+            primary, fast = self.llm, self.llm_fast
+        if (
+            not escalate
+            and fast is not None
+            and kind in self._FAST_KINDS
+            and len(prompt) < settings.LLM_FAST_PROMPT_MAX_CHARS
+        ):
+            return fast
+        return primary
+    
+    def _parse_response(self, response) -> Tuple[str, Optional[int]]:
+        """
+        Normalize a LangChain chat response to text and token usage.
+        
+        Args:
+            response: Message returned by the chat model
+            
+        Returns:
+            Tuple of (response_text, tokens_used)
+            
+        Raises:
+            LLMError: If the response is empty
+        """
+        content = response.content
+        # Normalize content to a string (LangChain may return list/dict parts)
+        if isinstance(content, list):
+            content = "".join(_part_to_str(part) for part in content).strip()
+        else:
+            content = str(content).strip() if content else ""
+        if not content:
+            raise LLMError("Empty response from LLM")
+        
+        # Extract token usage from response metadata
+        tokens_used = None
+        if hasattr(response, 'response_metadata'):
+            usage = response.response_metadata.get('token_usage', {})
+            tokens_used = usage.get('total_tokens')
+        
+        # Standardized usage metadata also reports provider prompt-cache hits
+        # (e.g. OpenAI's automatic prefix caching of the system prompts)
+        usage_metadata = getattr(response, 'usage_metadata', None) or {}
+        if tokens_used is None:
+            tokens_used = usage_metadata.get('total_tokens')
+        cached_tokens = (usage_metadata.get('input_token_details') or {}).get('cache_read')
+        if cached_tokens:
+            logger.debug(
+                "Provider prompt cache hit: %s/%s input tokens cached",
+                cached_tokens,
+                usage_metadata.get('input_tokens')
+            )
+        
+        return content, tokens_used
+    
+    def stream_dot_code(self, prompt: str, max_tokens: int = 1024) -> AsyncIterator[str]:
+        """
+        Stream raw Graphviz DOT generation output as it is produced.
+        
+        Args:
+            prompt: Natural language description of the diagram
+            max_tokens: Maximum tokens for LLM response
+            
+        Returns:
+            Async iterator of text chunks; pass the joined text to
+            extract_code to obtain the final DOT code
+        """
+        return self.stream_code(prompt, "graphviz", max_tokens)
+    
+    async def stream_code(
+        self,
+        prompt: str,
+        kind: Literal["graphviz", "plantuml_wbs", "mermaid_gantt"],
+        max_tokens: int = 1024
+    ) -> AsyncIterator[str]:
+        """
+        Stream raw LLM output for a prompt chunk by chunk.
+        
+        Streaming is not retried: chunks already sent to the client cannot
+        be taken back. In fallback mode the mock code is yielded in one chunk.
+        
+        Args:
+            prompt: Natural language description of the diagram
+            kind: Diagram kind selecting the system prompt
+            max_tokens: Maximum tokens for LLM response
+            
+        Yields:
+            Text chunks in generation order
+            
+        Raises:
+            ValidationError: If the prompt is obviously invalid
+            LLMError: If the LLM call fails
+        """
+        self._validate_prompt(prompt, kind, max_tokens)
+        if not self._use_llm:
+            yield getattr(self, self._KINDS[kind][1])(prompt)
+            return
+        
+        if self.backend is not None:
+            # Raw SDK backends do not stream; yield the whole response at once
+            content, _ = await self._call_llm_with_prompt(prompt, max_tokens, kind)
+            yield content
+            return
+        
+        if self.llm is None:
+            raise ConfigurationError("LLM is not initialized; check provider configuration")
+        
+        messages = [self._SYSTEM_MESSAGES[kind], HumanMessage(content=prompt)]
+        llm = self._pick_llm(prompt, kind)
+        chunks: asyncio.Queue = asyncio.Queue()
+        done = object()
+        
+        async def produce() -> None:
+            # Chunks are buffered so the LLM slot is released as soon as the
+            # provider finishes, however slowly the client reads the stream
+            try:
+                async with _llm_semaphore, _llm_rate_limiter:
+                    async for chunk in llm.astream(messages):
+                        content = chunk.content
+                        if isinstance(content, list):
+                            content = "".join(_part_to_str(part) for part in content)
+                        if content:
+                            chunks.put_nowait(content)
+            finally:
+                chunks.put_nowait(done)
+        
+        producer = asyncio.create_task(produce())
+        try:
+            while (content := await chunks.get()) is not done:
+                yield content
+            await producer
+        except LLMError:
+            raise
+        except Exception as e:
+            logger.error("LLM streaming error (%s): %s", self.provider, e)
+            raise LLMError(f"LLM streaming call failed: {str(e)}") from e
+        finally:
+            producer.cancel()
+    
+    def extract_code(
+        self,
+        text: str,
+        kind: Literal["graphviz", "plantuml_wbs", "mermaid_gantt"]
+    ) -> str:
+        """
+        Extract and validate diagram code from complete LLM output.
+        
+        Args:
+            text: Full LLM response text (e.g. a joined stream)
+            kind: Diagram kind selecting the extractor
+            
+        Returns:
+            Extracted diagram code
+            
+        Raises:
+            LLMError: If the output does not contain valid code
+        """
+        return getattr(self, self._KINDS[kind][0])(text.strip())
+    
+    async def generate_batch(
+        self,
+        prompts: List[str],
+        kind: Literal["graphviz", "plantuml_wbs", "mermaid_gantt"],
+        max_tokens: int = 1024,
+        max_retries: int = 3
+    ) -> List[Tuple[str, Optional[int], int]]:
+        """
+        Generate diagram code for several prompts concurrently.
+        
+        Each prompt goes through the single-prompt generator, so caching,
+        coalescing of identical prompts, extraction and retries behave
+        exactly as for one call. The calls run together with asyncio.gather,
+        bounded by the process-wide LLM semaphore and rate limiter.
+        
+        Args:
+            prompts: Natural language descriptions
+            kind: System prompt key selecting the diagram type
+            max_tokens: Maximum tokens for each LLM response
+            max_retries: Number of retry attempts for each prompt
+            
+        Returns:
+            List of (code, tokens_used, latency_ms) tuples in prompt order
+            
+        Raises:
+            ValidationError: If any prompt is obviously invalid
+            LLMError: If any prompt still fails after retries
+        """
+        # Reject the whole batch before any LLM work is started
+        for prompt in prompts:
+            self._validate_prompt(prompt, kind, max_tokens)
+        
+        results = await asyncio.gather(
+            *(self._generate(prompt, kind, max_tokens, max_retries) for prompt in prompts)
+        )
+        logger.info("Generated %d %s diagrams in batch", len(prompts), kind)
+        return list(results)
     
     def _extract_dot(self, llm_response: str) -> str:
         """
@@ -495,8 +1120,7 @@ Generate ONLY the Mermaid Gantt code based on the user's description. No explana
             LLMError: If no valid DOT code found
         """
         # Try to extract from code fence first (```dot or ```graphviz or just ```)
-        code_fence_pattern = r"```(?:dot|graphviz)?\s*\n(.*?)\n```"
-        match = re.search(code_fence_pattern, llm_response, re.DOTALL)
+        match = _DOT_FENCE_RE.search(llm_response) if "```" in llm_response else None
         
         if match:
             dot_code = match.group(1).strip()
@@ -504,12 +1128,21 @@ Generate ONLY the Mermaid Gantt code based on the user's description. No explana
             # No code fence, use the entire response
             dot_code = llm_response.strip()
         
-        # Basic validation: should contain 'graph' or 'digraph'
-        if not re.search(r'\b(di)?graph\b', dot_code, re.IGNORECASE):
+        # Basic validation: should contain 'graph' or 'digraph' (the regex scan
+        # is only needed when the code does not already start with one)
+        if (
+            not dot_code.startswith(("digraph", "graph", "strict"))
+            and not _DOT_KEYWORD_RE.search(dot_code)
+        ):
             raise LLMError(
                 "Invalid DOT code: must contain 'graph' or 'digraph' declaration"
             )
         
+        if not _DOT_STRUCTURE_RE.search(dot_code):
+            raise LLMError(
+                "Malformed DOT code: expected a graph declaration followed by a braced body"
+            )
+        
         return dot_code
     
     async def generate_wbs_code(
@@ -532,67 +1165,7 @@ Generate ONLY the Mermaid Gantt code based on the user's description. No explana
         Raises:
             LLMError: If LLM call fails after retries
         """
-        start_time = datetime.now(timezone.utc)
-        
-        if not self._use_llm:
-            plantuml_code = self._fallback_mock_wbs(prompt)
-            latency_ms = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
-            return plantuml_code, None, latency_ms
-        
-        # Try with retries and exponential backoff
-        for attempt in range(max_retries):
-            try:
-                response, tokens_used = await self._call_llm_wbs_async(prompt, max_tokens)
-                plantuml_code = self._extract_plantuml(response)
-                latency_ms = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
-                
-                logger.info(
-                    f"Successfully generated PlantUML WBS code "
-                    f"(tokens: {tokens_used}, latency: {latency_ms}ms)"
-                )
-                
-                return plantuml_code, tokens_used, latency_ms
-                
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
-                    logger.warning(
-                        f"LLM call failed (attempt {attempt + 1}/{max_retries}): {e}. "
-                        f"Retrying in {wait_time}s..."
-                    )
-                    await asyncio.sleep(wait_time)
-                else:
-                    latency_ms = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
-                    logger.error(f"LLM call failed after {max_retries} attempts: {e}")
-                    raise LLMError(
-                        f"Failed to generate PlantUML WBS code after {max_retries} attempts",
-                        detail=str(e)
-                    )
-        raise LLMError(
-            "WBS generation ended unexpectedly: no result produced",
-            detail="Internal error in generate_wbs_code control flow"
-        )
-    
-    async def _call_llm_wbs_async(
-        self,
-        prompt: str,
-        max_tokens: int
-    ) -> Tuple[str, Optional[int]]:
-        """
-        Call LLM API asynchronously for WBS generation.
-        
-        Args:
-            prompt: User prompt
-            max_tokens: Maximum tokens for response
-            
-        Returns:
-            Tuple of (response_text, tokens_used)
-        """
-        return await self._call_llm_with_prompt(
-            prompt=prompt,
-            max_tokens=max_tokens,
-            system_prompt=self.SYSTEM_PROMPTS["plantuml_wbs"]
-        )
+        return await self._generate(prompt, "plantuml_wbs", max_tokens, max_retries)
     
     def _extract_plantuml(self, llm_response: str) -> str:
         """
@@ -610,8 +1183,7 @@ Generate ONLY the Mermaid Gantt code based on the user's description. No explana
             LLMError: If no valid PlantUML code found
         """
         # Try to extract from code fence first (```plantuml or just ```)
-        code_fence_pattern = r"```(?:plantuml)?\s*\n(.*?)\n```"
-        match = re.search(code_fence_pattern, llm_response, re.DOTALL)
+        match = _PLANTUML_FENCE_RE.search(llm_response) if "```" in llm_response else None
         
         if match:
             plantuml_code = match.group(1).strip()
@@ -619,19 +1191,14 @@ Generate ONLY the Mermaid Gantt code based on the user's description. No explana
             # No code fence, use the entire response
             plantuml_code = llm_response.strip()
         
-        # Ensure proper tags
-        if not plantuml_code.startswith("@startwbs") and not plantuml_code.startswith("@startuml"):
+        # Ensure proper tags; afterwards the code always starts with
+        # '@startwbs' or '@startuml', so no further declaration check is needed
+        if not plantuml_code.startswith(("@startwbs", "@startuml")):
             plantuml_code = "@startwbs\n" + plantuml_code
         
-        if not plantuml_code.endswith("@endwbs") and not plantuml_code.endswith("@enduml"):
+        if not plantuml_code.endswith(("@endwbs", "@enduml")):
             plantuml_code = plantuml_code + "\n@endwbs"
         
-        # Basic validation: should contain '@startwbs' or '@startuml'
-        if not re.search(r'@start(wbs|uml)', plantuml_code, re.IGNORECASE):
-            raise LLMError(
-                "Invalid PlantUML code: must contain '@startwbs' or '@startuml' declaration"
-            )
-        
         return plantuml_code
     
     def _fallback_mock_wbs(self, prompt: str) -> str:
@@ -648,22 +1215,7 @@ Generate ONLY the Mermaid Gantt code based on the user's description. No explana
         """
         logger.info("Using fallback mock WBS generation")
         
-        # Extract potential project name from prompt
-        words = prompt.split()[:3]
-        project_name = " ".join(words).title() if words else "Example Project"
-        
-        return f"""@startwbs
-* {project_name}
-** Planning Phase
-*** Requirements Gathering
-*** Resource Allocation
-** Execution Phase
-*** Task Development
-*** Quality Assurance
-** Completion Phase
-*** Testing
-*** Deployment
-@endwbs"""
+        return _FALLBACK_WBS_TEMPLATE.format(project_name=_fallback_project_name(prompt))
     
     def _fallback_mock(self, prompt: str) -> str:
         """
@@ -680,40 +1232,10 @@ Generate ONLY the Mermaid Gantt code based on the user's description. No explana
         logger.info("Using fallback mock DOT generation")
         
         # Create a simple graph based on prompt keywords
-        is_directed = any(
-            word in prompt.lower() 
-            for word in ["flow", "process", "step", "sequence", "hierarchy"]
-        )
-        
-        if is_directed:
-            return """digraph example {
-    rankdir=TB;
-    node [shape=box, style=rounded];
-    
-    start [label="Start", shape=ellipse];
-    step1 [label="Process Step"];
-    step2 [label="Decision", shape=diamond];
-    end [label="End", shape=ellipse];
-    
-    start -> step1;
-    step1 -> step2;
-    step2 -> end [label="Complete"];
-}"""
-        else:
-            return """graph example {
-    node [shape=circle];
-    
-    A [label="Node A"];
-    B [label="Node B"];
-    C [label="Node C"];
-    D [label="Node D"];
-    
-    A -- B;
-    B -- C;
-    C -- D;
-    D -- A;
-    A -- C;
-}"""
+        prompt_lower = prompt.lower()
+        if any(word in prompt_lower for word in _DIRECTED_KEYWORDS):
+            return _FALLBACK_DOT_DIRECTED
+        return _FALLBACK_DOT_UNDIRECTED
     
     async def generate_gantt_code(
         self,
@@ -735,67 +1257,7 @@ Generate ONLY the Mermaid Gantt code based on the user's description. No explana
         Raises:
             LLMError: If LLM call fails after retries
         """
-        start_time = datetime.now(timezone.utc)
-        
-        if not self._use_llm:
-            mermaid_code = self._fallback_mock_gantt(prompt)
-            latency_ms = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
-            return mermaid_code, None, latency_ms
-        
-        # Try with retries and exponential backoff
-        for attempt in range(max_retries):
-            try:
-                response, tokens_used = await self._call_llm_gantt_async(prompt, max_tokens)
-                mermaid_code = self._extract_mermaid(response)
-                latency_ms = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
-                
-                logger.info(
-                    f"Successfully generated Mermaid Gantt code "
-                    f"(tokens: {tokens_used}, latency: {latency_ms}ms)"
-                )
-                
-                return mermaid_code, tokens_used, latency_ms
-                
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
-                    logger.warning(
-                        f"LLM call failed (attempt {attempt + 1}/{max_retries}): {e}. "
-                        f"Retrying in {wait_time}s..."
-                    )
-                    await asyncio.sleep(wait_time)
-                else:
-                    latency_ms = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
-                    logger.error(f"LLM call failed after {max_retries} attempts: {e}")
-                    raise LLMError(
-                        f"Failed to generate Mermaid Gantt code after {max_retries} attempts",
-                        detail=str(e)
-                    )
-        raise LLMError(
-            "Gantt generation ended unexpectedly: no result produced",
-            detail="Internal error in generate_gantt_code control flow"
-        )
-    
-    async def _call_llm_gantt_async(
-        self,
-        prompt: str,
-        max_tokens: int
-    ) -> Tuple[str, Optional[int]]:
-        """
-        Call LLM API asynchronously for Gantt chart generation.
-        
-        Args:
-            prompt: User prompt
-            max_tokens: Maximum tokens for response
-            
-        Returns:
-            Tuple of (response_text, tokens_used)
-        """
-        return await self._call_llm_with_prompt(
-            prompt=prompt,
-            max_tokens=max_tokens,
-            system_prompt=self.SYSTEM_PROMPTS["mermaid_gantt"]
-        )
+        return await self._generate(prompt, "mermaid_gantt", max_tokens, max_retries)
     
     def _extract_mermaid(self, llm_response: str) -> str:
         """
@@ -813,8 +1275,7 @@ Generate ONLY the Mermaid Gantt code based on the user's description. No explana
             LLMError: If no valid Mermaid code found
         """
         # Try to extract from code fence first (```mermaid or just ```)
-        code_fence_pattern = r"```(?:mermaid)?\s*\n(.*?)\n```"
-        match = re.search(code_fence_pattern, llm_response, re.DOTALL)
+        match = _MERMAID_FENCE_RE.search(llm_response) if "```" in llm_response else None
         
         if match:
             mermaid_code = match.group(1).strip()
@@ -823,11 +1284,16 @@ Generate ONLY the Mermaid Gantt code based on the user's description. No explana
             mermaid_code = llm_response.strip()
         
         # Basic validation: should contain 'gantt'
-        if not re.search(r'\bgantt\b', mermaid_code, re.IGNORECASE):
+        if not mermaid_code.startswith("gantt") and not _GANTT_KEYWORD_RE.search(mermaid_code):
             raise LLMError(
                 "Invalid Mermaid code: must contain 'gantt' declaration"
             )
         
+        if not _GANTT_STRUCTURE_RE.search(mermaid_code):
+            raise LLMError(
+                "Malformed Mermaid code: expected 'gantt', 'dateFormat' and at least one 'section'"
+            )
+        
         return mermaid_code
     
     def _fallback_mock_gantt(self, prompt: str) -> str:
@@ -844,26 +1310,15 @@ Generate ONLY the Mermaid Gantt code based on the user's description. No explana
         """
         logger.info("Using fallback mock Gantt generation")
         
-        # Extract potential project name from prompt
-        words = prompt.split()[:3]
-        project_name = " ".join(words).title() if words else "Example Project"
-        
-        return f"""gantt
-    title {project_name}
-    dateFormat YYYY-MM-DD
-    axisFormat %b %d
-    
-    section Planning
-    Requirements :done, req, 2025-01-01, 5d
-    Design :active, design, after req, 7d
-    
-    section Development
-    Backend :dev1, after design, 10d
-    Frontend :dev2, after design, 8d
-    
-    section Testing
-    QA Testing :crit, test, after dev1 dev2, 5d
-    
-    section Deployment
-    Deploy :milestone, after test, 0d"""
+        return _FALLBACK_GANTT_TEMPLATE.format(project_name=_fallback_project_name(prompt))
 
+
+@functools.cache
+def get_llm_service() -> LLMService:
+    """
+    Get the process-wide LLM service.
+    
+    The service keeps no per-request state, so a single instance and its
+    provider clients are shared by every request instead of being rebuilt.
+    """
+    return LLMService()
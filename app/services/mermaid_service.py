@@ -5,14 +5,20 @@ Handles Mermaid Gantt chart rendering to SVG/PNG images using mermaid.ink API
 with validation and error handling.
 """
 import base64
+import re
 from typing import Literal
 import httpx
 
+from app.core.config import settings
 from app.core.exceptions import RenderError, ValidationError
+from app.utils.http_client import RENDER_TIMEOUT, get_http_client
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Case-insensitive search avoids lowercasing a copy of the whole chart
+_GANTT_RE = re.compile("gantt", re.IGNORECASE)
+
 
 class MermaidService:
     """Service class for rendering Mermaid Gantt charts to images via mermaid.ink API."""
@@ -32,6 +38,13 @@ class MermaidService:
         Raises:
             ValidationError: If Mermaid code is invalid
         """
+        # Check maximum length before encoding anything
+        if len(mermaid_code) > settings.MAX_MERMAID_LENGTH:
+            logger.warning("Rejected Mermaid code of %d characters", len(mermaid_code))
+            raise ValidationError(
+                f"Mermaid code exceeds the limit of {settings.MAX_MERMAID_LENGTH} characters"
+            )
+        
         mermaid_code = mermaid_code.strip()
         
         # Check minimum length
@@ -39,7 +52,7 @@ class MermaidService:
             raise ValidationError("Mermaid code too short")
         
         # Check for gantt declaration
-        if "gantt" not in mermaid_code.lower():
+        if not _GANTT_RE.search(mermaid_code):
             raise ValidationError("Mermaid code must contain 'gantt' declaration")
     
     @staticmethod
@@ -62,14 +75,14 @@ class MermaidService:
             RenderError: If rendering fails
         """
         # Validate format
-        if fmt not in ["svg", "png"]:
+        if fmt not in ("svg", "png"):
             raise ValidationError(f"Invalid format: {fmt}. Must be 'svg' or 'png'")
         
         # Validate Mermaid syntax
         MermaidService.validate_mermaid_gantt_syntax(mermaid_code)
         
         try:
-            logger.info(f"Rendering Mermaid Gantt chart with format={fmt}")
+            logger.info("Rendering Mermaid Gantt chart with format=%s", fmt)
             
             # Encode mermaid text to URL-safe base64 as mermaid.ink expects
             mermaid_bytes = mermaid_code.encode("utf-8")
@@ -79,16 +92,14 @@ class MermaidService:
             base_url = MermaidService.MERMAID_INK_SVG_URL if fmt == "svg" else MermaidService.MERMAID_INK_PNG_URL
             url = base_url + base64_encoded
             
-            logger.info(f"Fetching image from mermaid.ink: {url[:100]}...")
+            logger.info("Fetching image from mermaid.ink: %.100s...", url)
             
-            # Make async HTTP request to mermaid.ink
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                
-                output_bytes = response.content
+            # Make async HTTP request to mermaid.ink over the shared pooled client
+            response = await get_http_client().get(url, timeout=RENDER_TIMEOUT)
+            response.raise_for_status()
+            output_bytes = response.content
             
-            logger.info(f"Successfully rendered {len(output_bytes)} bytes")
+            logger.info("Successfully rendered %d bytes", len(output_bytes))
             return output_bytes
             
         except httpx.HTTPStatusError as e:
@@ -96,11 +107,21 @@ class MermaidService:
             logger.error(error_msg)
             raise RenderError(error_msg) from e
         
-        except httpx.TimeoutException as e:
+        except httpx.ConnectTimeout as e:
             error_msg = "Timeout while connecting to mermaid.ink API"
             logger.error(error_msg)
             raise RenderError(error_msg) from e
         
+        except httpx.ReadTimeout as e:
+            error_msg = "Timeout while waiting for mermaid.ink API to render the chart"
+            logger.error(error_msg)
+            raise RenderError(error_msg) from e
+        
+        except httpx.TimeoutException as e:
+            error_msg = "Timeout while communicating with mermaid.ink API"
+            logger.error(error_msg)
+            raise RenderError(error_msg) from e
+        
         except httpx.RequestError as e:
             error_msg = f"Failed to connect to mermaid.ink API: {str(e)}"
             logger.error(error_msg)
@@ -5,16 +5,29 @@ Handles PlantUML WBS code rendering to SVG/PNG images via remote server
 with validation and error handling.
 """
 import zlib
-import base64
 from typing import Literal
 import httpx
 
+# pybase64 provides a SIMD-accelerated drop-in for the stdlib module
+try:
+    import pybase64 as _b64
+except ImportError:
+    import base64 as _b64
+
 from app.core.config import settings
 from app.core.exceptions import RenderError, ValidationError
+from app.utils.http_client import RENDER_TIMEOUT, get_http_client
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Maps standard base64 output onto PlantUML's alphabet. PlantUML zero-pads the
+# final 3-byte group instead of using '=', and a zero sextet encodes to '0'.
+_PLANTUML_TRANSLATE = bytes.maketrans(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=",
+    b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-_0"
+)
+
 
 class PlantUMLService:
     """Service class for rendering PlantUML WBS code to images via remote server."""
@@ -30,6 +43,13 @@ class PlantUMLService:
         Raises:
             ValidationError: If PlantUML code is invalid
         """
+        # Check maximum length before compressing or encoding anything
+        if len(code) > settings.MAX_PLANTUML_LENGTH:
+            logger.warning("Rejected PlantUML code of %d characters", len(code))
+            raise ValidationError(
+                f"PlantUML code exceeds the limit of {settings.MAX_PLANTUML_LENGTH} characters"
+            )
+        
         code = code.strip()
         
         # Check minimum length
@@ -37,11 +57,11 @@ class PlantUMLService:
             raise ValidationError("PlantUML code too short")
         
         # Check for @startwbs or @startuml tags
-        if not (code.startswith("@startwbs") or code.startswith("@startuml")):
+        if not code.startswith(("@startwbs", "@startuml")):
             raise ValidationError("PlantUML code must start with '@startwbs' or '@startuml'")
         
         # Check for @endwbs or @enduml tags
-        if not (code.endswith("@endwbs") or code.endswith("@enduml")):
+        if not code.endswith(("@endwbs", "@enduml")):
             raise ValidationError("PlantUML code must end with '@endwbs' or '@enduml'")
     
     @staticmethod
@@ -58,34 +78,12 @@ class PlantUMLService:
         Returns:
             Encoded string suitable for PlantUML URL
         """
-        # PlantUML uses a custom base64 alphabet
-        plantuml_alphabet = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-_'
-        
-        def encode3bytes(b1, b2, b3):
-            """Encode 3 bytes into 4 characters using PlantUML alphabet."""
-            c1 = b1 >> 2
-            c2 = ((b1 & 0x3) << 4) | (b2 >> 4)
-            c3 = ((b2 & 0xF) << 2) | (b3 >> 6)
-            c4 = b3 & 0x3F
-            return (plantuml_alphabet[c1 & 0x3F] +
-                    plantuml_alphabet[c2 & 0x3F] +
-                    plantuml_alphabet[c3 & 0x3F] +
-                    plantuml_alphabet[c4 & 0x3F])
-        
-        # Compress using deflate
-        compressed = zlib.compress(plantuml_text.encode('utf-8'))[2:-4]  # Remove zlib header/footer
-        
-        # Encode compressed data
-        result = []
-        for i in range(0, len(compressed), 3):
-            if i + 2 < len(compressed):
-                result.append(encode3bytes(compressed[i], compressed[i + 1], compressed[i + 2]))
-            elif i + 1 < len(compressed):
-                result.append(encode3bytes(compressed[i], compressed[i + 1], 0))
-            else:
-                result.append(encode3bytes(compressed[i], 0, 0))
+        # Compress to a raw deflate stream (no zlib header or Adler-32 trailer)
+        compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        compressed = compressor.compress(plantuml_text.encode('utf-8')) + compressor.flush()
         
-        return ''.join(result)
+        # Standard base64 in C, then remap to the PlantUML alphabet
+        return _b64.b64encode(compressed).translate(_PLANTUML_TRANSLATE).decode('ascii')
     
     @staticmethod
     async def render_wbs_to_bytes(
@@ -107,33 +105,41 @@ class PlantUMLService:
             RenderError: If rendering fails
         """
         # Validate format
-        if fmt not in ["svg", "png"]:
+        if fmt not in ("svg", "png"):
             raise ValidationError(f"Invalid format: {fmt}. Must be 'svg' or 'png'")
         
         # Validate PlantUML syntax
         PlantUMLService.validate_plantuml_syntax(plantuml_code)
         
         try:
-            logger.info(f"Rendering PlantUML WBS with format={fmt}")
-            
-            # Encode PlantUML code
-            encoded = PlantUMLService._encode_plantuml(plantuml_code)
+            logger.info("Rendering PlantUML WBS with format=%s", fmt)
             
             # Build URL for PlantUML server
             base_url = settings.PLANTUML_SERVER_URL.rstrip('/')
             format_path = "svg" if fmt == "svg" else "png"
-            url = f"{base_url}/{format_path}/{encoded}"
             
-            logger.info(f"PlantUML server URL: {url}")
-            logger.info(f"Requesting PlantUML rendering from: {base_url}")
+            logger.info("Requesting PlantUML rendering from: %s", base_url)
             
-            # Fetch the rendered image from PlantUML server
-            async with httpx.AsyncClient(timeout=60.0, follow_redirects=True) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                output_bytes = response.content
+            # Fetch the rendered image from PlantUML server over the shared pooled client
+            if settings.PLANTUML_USE_POST:
+                # Send the source as the request body, skipping deflate and the
+                # URL encoding and keeping large diagrams clear of URL limits
+                response = await get_http_client().post(
+                    f"{base_url}/{format_path}",
+                    content=plantuml_code.encode("utf-8"),
+                    headers={"Content-Type": "text/plain; charset=utf-8"},
+                    timeout=RENDER_TIMEOUT,
+                    follow_redirects=True
+                )
+            else:
+                encoded = PlantUMLService._encode_plantuml(plantuml_code)
+                url = f"{base_url}/{format_path}/{encoded}"
+                logger.info("PlantUML server URL: %s", url)
+                response = await get_http_client().get(url, timeout=RENDER_TIMEOUT, follow_redirects=True)
+            response.raise_for_status()
+            output_bytes = response.content
             
-            logger.info(f"Successfully rendered {len(output_bytes)} bytes")
+            logger.info("Successfully rendered %d bytes", len(output_bytes))
             return output_bytes
             
         except httpx.HTTPStatusError as e:
@@ -141,6 +147,16 @@ class PlantUMLService:
             logger.error(error_msg)
             raise RenderError(error_msg) from e
         
+        except httpx.ConnectTimeout as e:
+            error_msg = "Timeout while connecting to PlantUML server"
+            logger.error(error_msg)
+            raise RenderError(error_msg) from e
+        
+        except httpx.ReadTimeout as e:
+            error_msg = "Timeout while waiting for PlantUML server to render the diagram"
+            logger.error(error_msg)
+            raise RenderError(error_msg) from e
+        
         except httpx.RequestError as e:
             error_msg = f"Failed to connect to PlantUML server: {str(e)}"
             logger.error(error_msg)
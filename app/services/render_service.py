@@ -4,16 +4,49 @@ Render Service - Business Logic for Graphviz Rendering
 Handles Graphviz DOT code rendering to SVG/PNG images with validation
 and error handling.
 """
+import asyncio
 import logging
+import os
+import threading
 from typing import Literal
 import graphviz
 from graphviz import ExecutableNotFound
 
+from app.core.config import settings
 from app.core.exceptions import RenderError, ValidationError
 from app.utils.logger import get_logger
 
+# In-process rendering through libgvc avoids a fork/exec per diagram
+try:
+    import pygraphviz
+except ImportError:
+    pygraphviz = None
+
 logger = get_logger(__name__)
 
+_DOT_DECLARATIONS = ("graph", "digraph", "strict graph", "strict digraph")
+_VALID_FORMATS = frozenset({"svg", "png"})
+_VALID_ENGINES = ("dot", "neato", "fdp", "sfdp", "twopi", "circo")
+# Subgraph/attribute blocks beyond this are pathological for layout
+_MAX_DOT_BLOCKS = 10000
+
+# Each render runs a CPU-bound Graphviz layout, in a subprocess or in-process;
+# more than one per core only adds contention
+_render_semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+
+# libcgraph/libgvc keep global state and are not thread-safe, so in-process
+# renders run one at a time per process. That saves the per-render process
+# spawn but gives up the parallelism of the subprocess path, which makes
+# GRAPHVIZ_IN_PROCESS a latency trade-off rather than a throughput gain.
+_gvc_lock = threading.Lock()
+
+
+def _render_in_process(dot: str, fmt: str, engine: str) -> bytes:
+    """Render DOT code with pygraphviz, serialized on the libgvc lock."""
+    with _gvc_lock:
+        graph = pygraphviz.AGraph(string=dot)
+        return graph.draw(format=fmt, prog=engine)
+
 
 class RenderService:
     """Service class for rendering Graphviz DOT code to images."""
@@ -29,6 +62,13 @@ class RenderService:
         Raises:
             ValidationError: If DOT code is invalid
         """
+        # Check maximum length before any copying or scanning
+        if len(dot) > settings.MAX_DOT_LENGTH:
+            logger.warning("Rejected DOT code of %d characters", len(dot))
+            raise ValidationError(
+                f"DOT code exceeds the limit of {settings.MAX_DOT_LENGTH} characters"
+            )
+        
         dot = dot.strip()
         
         # Check minimum length
@@ -36,17 +76,18 @@ class RenderService:
             raise ValidationError("DOT code too short")
         
         # Check for graph declaration
-        if not (dot.startswith("graph") or dot.startswith("digraph") or 
-                dot.startswith("strict graph") or dot.startswith("strict digraph")):
+        if not dot.startswith(_DOT_DECLARATIONS):
             raise ValidationError("DOT code must start with 'graph' or 'digraph'")
         
-        # Check for balanced braces
-        if dot.count("{") != dot.count("}"):
+        # Check that there's a braced body and that braces are balanced
+        opening = dot.count("{")
+        if opening != dot.count("}"):
             raise ValidationError("Unbalanced braces in DOT code")
-        
-        # Check that there's at least one opening and closing brace
-        if "{" not in dot or "}" not in dot:
+        if not opening:
             raise ValidationError("DOT code must contain graph body in braces")
+        if opening > _MAX_DOT_BLOCKS:
+            logger.warning("Rejected DOT code with %d braced blocks", opening)
+            raise ValidationError(f"DOT code exceeds {_MAX_DOT_BLOCKS} braced blocks")
     
     @staticmethod
     async def render_to_bytes(
@@ -70,33 +111,39 @@ class RenderService:
             RenderError: If rendering fails
         """
         # Validate format
-        if fmt not in ["svg", "png"]:
+        if fmt not in _VALID_FORMATS:
             raise ValidationError(f"Invalid format: {fmt}. Must be 'svg' or 'png'")
         
         # Validate engine
-        valid_engines = ["dot", "neato", "fdp", "sfdp", "twopi", "circo"]
-        if engine not in valid_engines:
+        if engine not in _VALID_ENGINES:
             raise ValidationError(
-                f"Invalid engine: {engine}. Must be one of {valid_engines}"
+                f"Invalid engine: {engine}. Must be one of {list(_VALID_ENGINES)}"
             )
         
         # Validate DOT syntax
         RenderService.validate_dot_syntax(dot)
         
         try:
-            # Create Source object from DOT code
-            src = graphviz.Source(
-                source=dot,
-                engine=engine,
-                format=fmt
-            )
-            
-            logger.info(f"Rendering DOT with engine={engine}, format={fmt}")
+            logger.info("Rendering DOT with engine=%s, format=%s", engine, fmt)
             
-            # Use pipe() method to get bytes directly without file I/O
-            output_bytes = src.pipe(format=fmt, encoding=None)
+            # Both modes are bounded, so queued renders wait here rather
+            # than holding worker threads blocked on the subprocess or lock
+            async with _render_semaphore:
+                if settings.GRAPHVIZ_IN_PROCESS and pygraphviz is not None:
+                    output_bytes = await asyncio.to_thread(_render_in_process, dot, fmt, engine)
+                else:
+                    # Create Source object from DOT code
+                    src = graphviz.Source(
+                        source=dot,
+                        engine=engine,
+                        format=fmt
+                    )
+                    
+                    # Use pipe() method to get bytes directly without file I/O; it
+                    # blocks on the subprocess, so run it in a worker thread
+                    output_bytes = await asyncio.to_thread(src.pipe, format=fmt, encoding=None)
             
-            logger.info(f"Successfully rendered {len(output_bytes)} bytes")
+            logger.info("Successfully rendered %d bytes", len(output_bytes))
             return output_bytes
             
         except ExecutableNotFound as e:
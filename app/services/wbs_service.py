@@ -5,17 +5,25 @@ Orchestrates the complete WBS diagram generation workflow including:
 - LLM generation of PlantUML code
 - PlantUML rendering to images
 """
-from typing import Tuple, Literal
-from datetime import datetime, timezone
+import asyncio
+import time
+from typing import List, Tuple, Literal
 
 from app.core.config import settings
-from app.core.exceptions import DiagramGenerationError
-from app.services.llm_service import LLMService
+from app.core.exceptions import DiagramGenerationError, ValidationError
+from app.services.llm_service import get_llm_service
 from app.services.plantuml_service import PlantUMLService
+from app.utils.cache import LRUCache, cached_render
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Rendered images keyed by (format, PlantUML code), shared across service instances
+_render_cache: LRUCache[bytes] = LRUCache(
+    maxsize=settings.RENDER_CACHE_MAX_ENTRIES,
+    ttl=settings.RENDER_CACHE_TTL_SECONDS
+)
+
 
 class WBSService:
     """
@@ -26,7 +34,7 @@ class WBSService:
     
     def __init__(self):
         """Initialize service."""
-        self.llm_service = LLMService()
+        self.llm_service = get_llm_service()
         self.plantuml_service = PlantUMLService()
     
     async def generate_wbs(
@@ -50,11 +58,12 @@ class WBSService:
             Tuple of (image_bytes, plantuml_code)
             
         Raises:
+            ValidationError: If the prompt is rejected before the LLM call
             DiagramGenerationError: If generation fails
         """
-        start_time = datetime.now(timezone.utc)
+        start_time = time.perf_counter()
         
-        logger.info(f"Generating WBS: prompt='{prompt[:50]}...', format={format}")
+        logger.info("Generating WBS: prompt='%.50s...', format=%s", prompt, format)
         
         # Step 1: Generate PlantUML code via LLM
         try:
@@ -63,10 +72,12 @@ class WBSService:
                 max_tokens=settings.MAX_TOKENS
             )
             
-            logger.info(f"Generated PlantUML code ({len(plantuml_code)} characters)")
+            logger.info("Generated PlantUML code (%d characters)", len(plantuml_code))
             
+        except ValidationError:
+            raise
         except Exception as e:
-            logger.error(f"LLM generation failed: {e}")
+            logger.error("LLM generation failed: %s", e)
             raise DiagramGenerationError(
                 "Failed to generate WBS from prompt",
                 detail=str(e)
@@ -74,30 +85,61 @@ class WBSService:
         
         # Step 2: Render PlantUML code to image
         try:
-            image_bytes = await self.plantuml_service.render_wbs_to_bytes(
-                plantuml_code=plantuml_code,
-                fmt=format
+            image_bytes = await cached_render(
+                _render_cache,
+                self.plantuml_service.render_wbs_to_bytes,
+                plantuml_code,
+                format
             )
             
-            logger.info(f"Rendered WBS diagram ({len(image_bytes)} bytes)")
+            logger.info("Rendered WBS diagram (%d bytes)", len(image_bytes))
             
         except Exception as e:
-            logger.error(f"Rendering failed: {e}")
+            logger.error("Rendering failed: %s", e)
             raise DiagramGenerationError(
                 "Failed to render WBS diagram",
                 detail=str(e)
             )
         
         # Log success
-        total_time_ms = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
+        total_time_ms = int((time.perf_counter() - start_time) * 1000)
         
         logger.info(
-            f"Successfully generated WBS in {total_time_ms}ms "
-            f"(LLM: {llm_latency_ms}ms, tokens: {tokens_used})"
+            "Successfully generated WBS in %sms "
+            "(LLM: %sms, tokens: %s)",
+            total_time_ms,
+            llm_latency_ms,
+            tokens_used
         )
         
         return image_bytes, plantuml_code
     
+    async def generate_wbs_batch(
+        self,
+        prompts: List[str],
+        format: Literal['svg', 'png'] = "svg"
+    ) -> List[Tuple[bytes, str]]:
+        """
+        Generate several WBS diagrams concurrently.
+        
+        Each prompt runs its own LLM-then-render pipeline, so a diagram starts
+        rendering as soon as its code is ready rather than after the whole
+        batch. Concurrency stays bounded by the LLM limiter and the shared
+        HTTP connection pool.
+        
+        Args:
+            prompts: Natural language descriptions
+            format: Output format (svg or png)
+            
+        Returns:
+            List of (image_bytes, plantuml_code) tuples in prompt order
+            
+        Raises:
+            DiagramGenerationError: If any generation fails
+        """
+        logger.info("Generating %d WBS diagrams concurrently", len(prompts))
+        return list(await asyncio.gather(*(self.generate_wbs(prompt, format) for prompt in prompts)))
+    
     async def preview_wbs(
         self,
         plantuml_code: str,
@@ -116,19 +158,21 @@ class WBSService:
         Raises:
             DiagramGenerationError: If rendering fails
         """
-        logger.info(f"Previewing WBS: format={format}")
+        logger.info("Previewing WBS: format=%s", format)
         
         try:
-            image_bytes = await self.plantuml_service.render_wbs_to_bytes(
-                plantuml_code=plantuml_code,
-                fmt=format
+            image_bytes = await cached_render(
+                _render_cache,
+                self.plantuml_service.render_wbs_to_bytes,
+                plantuml_code,
+                format
             )
             
-            logger.info(f"Preview rendered ({len(image_bytes)} bytes)")
+            logger.info("Preview rendered (%d bytes)", len(image_bytes))
             return image_bytes
             
         except Exception as e:
-            logger.error(f"Preview rendering failed: {e}")
+            logger.error("Preview rendering failed: %s", e)
             raise DiagramGenerationError(
                 "Failed to preview WBS diagram",
                 detail=str(e)
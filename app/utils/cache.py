@@ -0,0 +1,127 @@
+"""
+In-Process Cache Utility
+
+Provides a small LRU cache and content-addressed cache keys used to
+skip repeated renders and LLM calls for identical inputs.
+"""
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+from app.utils.logger import get_logger
+
+# BLAKE3 is SIMD-accelerated and much faster than BLAKE2b on multi-KB
+# inputs such as rendered diagram code; keys are process-local, so either works
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:
+    _blake3 = None
+
+logger = get_logger(__name__)
+
+V = TypeVar("V")
+
+
+def make_cache_key(*parts: str) -> bytes:
+    """
+    Build a compact content-addressed cache key.
+
+    Args:
+        *parts: String components identifying the cached value
+
+    Returns:
+        16-byte BLAKE3 (or BLAKE2b fallback) digest of the joined parts
+    """
+    data = "\0".join(parts).encode("utf-8")
+    if _blake3 is not None:
+        return _blake3(data).digest(length=16)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class LRUCache(Generic[V]):
+    """
+    Least-recently-used cache with a bounded number of entries.
+
+    Operations never await, so they are atomic with respect to other
+    coroutines on the event loop and need no lock. A maxsize of 0
+    disables caching; entries expire after ttl seconds when one is set.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """
+        Get a cached value and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        try:
+            expires_at, value = self._data[key]
+        except KeyError:
+            return None
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """
+        Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else math.inf
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+async def cached_render(
+    cache: LRUCache[bytes],
+    render: Callable[[str, str], Awaitable[bytes]],
+    code: str,
+    fmt: str
+) -> bytes:
+    """
+    Render diagram code, reusing a cached image for identical input.
+
+    Args:
+        cache: Render cache keyed by (format, code)
+        render: Coroutine function taking (code, fmt) and returning image bytes
+        code: Diagram source code
+        fmt: Output format
+
+    Returns:
+        Rendered image bytes
+    """
+    key = make_cache_key(fmt, code)
+    image_bytes = cache.get(key)
+    if image_bytes is not None:
+        logger.info("Render cache hit")
+        return image_bytes
+
+    image_bytes = await render(code, fmt)
+    cache.set(key, image_bytes)
+    return image_bytes
@@ -0,0 +1,48 @@
+"""
+Shared HTTP Client Utility
+
+Provides a process-wide httpx.AsyncClient so outbound API calls reuse
+warm connections instead of paying DNS, TCP and TLS setup per request.
+"""
+from typing import Optional
+
+import httpx
+
+# HTTP/2 multiplexing needs h2, installed by the httpx[http2] dependency;
+# fall back to HTTP/1.1 in environments that installed httpx without it
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Outbound render calls: fail fast when a server cannot be reached, allow
+# longer for the image itself, and queue for a pooled connection indefinitely
+RENDER_TIMEOUT = httpx.Timeout(connect=3.0, read=25.0, write=5.0, pool=None)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared async HTTP client, creating it on first use.
+
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=50)
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared async HTTP client if it was created."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
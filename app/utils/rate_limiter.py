@@ -0,0 +1,50 @@
+"""
+Async Rate Limiter Utility
+
+Provides a token-bucket rate limiter so outbound API calls wait
+cooperatively instead of being rejected upstream with HTTP 429.
+"""
+import asyncio
+import time
+
+
+class AsyncRateLimiter:
+    """
+    Token-bucket rate limiter for coroutines.
+
+    Allows bursts of up to max_rate acquisitions and refills continuously
+    at max_rate per time_period. A max_rate of 0 disables limiting.
+
+    Usage:
+        async with limiter:
+            await call_api()
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 60.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = float(max_rate)
+        self._last_refill = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and consume it."""
+        if self.max_rate <= 0:
+            return
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.max_rate),
+                self._tokens + (now - self._last_refill) * self.max_rate / self.time_period
+            )
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) * self.time_period / self.max_rate)
+
+    async def __aenter__(self) -> "AsyncRateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
@@ -2,26 +2,48 @@
 Test Configuration and Fixtures
 
 Provides pytest fixtures for testing the application including:
-- Test client
+- Test client (over a shared ASGI transport)
+- LLM service forced into fallback mode
 - Sample test data
 """
 import pytest
 import pytest_asyncio
 from typing import AsyncGenerator
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient
 
+from app.core.config import settings
 from app.main import app
+from app.services.llm_service import LLMService
+
+
+@pytest.fixture(scope="session")
+def asgi_transport() -> ASGITransport:
+    """
+    Create one ASGI transport for the app, shared by every test.
+    """
+    return ASGITransport(app=app)
 
 
 @pytest_asyncio.fixture(scope="function")
-async def client() -> AsyncGenerator[AsyncClient, None]:
+async def client(asgi_transport: ASGITransport) -> AsyncGenerator[AsyncClient, None]:
     """
     Create a test client for API testing.
     """
-    async with AsyncClient(app=app, base_url="http://test") as test_client:
+    async with AsyncClient(transport=asgi_transport, base_url="http://test") as test_client:
         yield test_client
 
 
+@pytest.fixture
+def llm_service(monkeypatch) -> LLMService:
+    """
+    LLM service in fallback mode, regardless of keys in the ambient .env.
+    """
+    for key in ("OPENAI_API_KEY", "NVIDIA_API_KEY", "GOOGLE_API_KEY"):
+        monkeypatch.setattr(settings, key, None)
+    monkeypatch.setattr(settings, "LLM_RAW_SDK", False)
+    return LLMService()
+
+
 @pytest.fixture
 def sample_dot_code() -> str:
     """Sample DOT code for testing."""
@@ -1,9 +1,18 @@
 """
 Integration tests for diagram endpoints.
 """
+import base64
+import json
+
 import pytest
 from httpx import AsyncClient
 
+from app.controller.diagram_controller import _sse_event
+from app.core.config import settings
+from app.core.exceptions import ConfigurationError
+from app.services import diagram_service
+from app.services.render_service import RenderService
+
 
 @pytest.mark.asyncio
 async def test_preview_diagram(client: AsyncClient, sample_dot_code: str):
@@ -58,3 +67,104 @@ async def test_preview_diagram_invalid_dot(client: AsyncClient):
     assert response.status_code == 500
 
 
+def _parse_sse(body: str) -> list:
+    """Split a server-sent event stream into (event, data) pairs."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = block.split("\n")
+        event = lines[0].removeprefix("event: ")
+        data = "\n".join(line.removeprefix("data: ") for line in lines[1:])
+        events.append((event, data))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_stream_diagram(client: AsyncClient, llm_service, monkeypatch):
+    """Test that the stream endpoint emits token events and a final result."""
+    async def fake_render(dot, fmt="svg", engine="dot"):
+        return b"<svg/>"
+    
+    monkeypatch.setattr(diagram_service, "get_llm_service", lambda: llm_service)
+    monkeypatch.setattr(RenderService, "render_to_bytes", staticmethod(fake_render))
+    
+    response = await client.post(
+        "/api/diagram/stream",
+        json={"prompt": "A simple process flow", "format": "svg"}
+    )
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(response.text)
+    assert events[0][0] == "token"
+    assert events[-1][0] == "result"
+    result = json.loads(events[-1][1])
+    assert result["diagram_dot"].startswith("digraph")
+    assert base64.b64decode(result["image_base64"]) == b"<svg/>"
+
+
+@pytest.mark.asyncio
+async def test_stream_diagram_rejected_prompt(client: AsyncClient, llm_service, monkeypatch):
+    """Test that a prompt the LLM service rejects gets a 400 before streaming starts."""
+    monkeypatch.setattr(diagram_service, "get_llm_service", lambda: llm_service)
+    monkeypatch.setattr(settings, "MAX_PROMPT_LENGTH", 10)
+    
+    response = await client.post(
+        "/api/diagram/stream",
+        json={"prompt": "A prompt longer than the limit", "format": "svg"}
+    )
+    
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Prompt too long"
+
+
+@pytest.mark.asyncio
+async def test_stream_diagram_reports_configuration_error(client: AsyncClient, monkeypatch):
+    """Test that a configuration failure mid-stream gets its own error message."""
+    async def failing_stream(self, prompt):
+        yield "token", "digraph"
+        raise ConfigurationError("LLM is not initialized")
+    
+    monkeypatch.setattr(diagram_service.DiagramService, "stream_dot_code", failing_stream)
+    
+    response = await client.post(
+        "/api/diagram/stream",
+        json={"prompt": "A simple process flow", "format": "svg"}
+    )
+    
+    assert response.status_code == 200
+    assert _parse_sse(response.text) == [
+        ("token", "digraph"),
+        ("error", "Service configuration error: LLM is not initialized")
+    ]
+
+
+def test_sse_event_splits_carriage_returns():
+    """Test that CR and CRLF in data cannot break SSE framing."""
+    assert _sse_event("token", "a\r\nb\rc") == "event: token\ndata: a\ndata: b\ndata: c\n\n"
+    assert _sse_event("token", "") == "event: token\ndata: \n\n"
+
+
+@pytest.mark.asyncio
+async def test_generate_diagram_short_prompt(client: AsyncClient):
+    """Test that a prompt under 3 characters is rejected by the schema."""
+    response = await client.post(
+        "/api/diagram/generate",
+        json={"prompt": " ab ", "format": "svg"}
+    )
+    
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_generate_diagram_rejected_prompt(client: AsyncClient, llm_service, monkeypatch):
+    """Test that a prompt rejected by the LLM service is a 400, not a 500."""
+    monkeypatch.setattr(diagram_service, "get_llm_service", lambda: llm_service)
+    monkeypatch.setattr(settings, "MAX_PROMPT_LENGTH", 10)
+    
+    response = await client.post(
+        "/api/diagram/generate",
+        json={"prompt": "A prompt longer than the limit", "format": "svg"}
+    )
+    
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Prompt too long"
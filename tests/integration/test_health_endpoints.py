@@ -6,23 +6,12 @@ from httpx import AsyncClient
 
 
 @pytest.mark.asyncio
-async def test_health_check(client: AsyncClient):
-    """Test health check endpoint."""
-    response = await client.get("/health")
+@pytest.mark.parametrize("path", ["/health", "/api/health"])
+async def test_health_endpoint(client: AsyncClient, path: str):
+    """Test the root and API health check endpoints."""
+    response = await client.get(path)
     
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "ok"
     assert "version" in data
-
-
-@pytest.mark.asyncio
-async def test_api_health_check(client: AsyncClient):
-    """Test API health check endpoint."""
-    response = await client.get("/api/health")
-    
-    assert response.status_code == 200
-    data = response.json()
-    assert data["status"] == "ok"
-    assert "version" in data
-
@@ -0,0 +1,92 @@
+"""
+Unit tests for cache utilities.
+"""
+import time
+
+import pytest
+from app.utils.cache import LRUCache, cached_render, make_cache_key
+
+
+class TestLRUCache:
+    """Test cases for LRUCache."""
+
+    def test_get_miss_returns_none(self):
+        """Test lookup of a missing key."""
+        cache = LRUCache(maxsize=2)
+        assert cache.get("missing") is None
+
+    def test_set_and_get(self):
+        """Test storing and retrieving a value."""
+        cache = LRUCache(maxsize=2)
+        cache.set("a", b"image")
+        assert cache.get("a") == b"image"
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_zero_maxsize_disables_cache(self):
+        """Test that maxsize=0 stores nothing."""
+        cache = LRUCache(maxsize=0)
+        cache.set("a", 1)
+        assert len(cache) == 0
+        assert cache.get("a") is None
+
+    def test_expired_entry_is_a_miss(self):
+        """Test that entries are dropped once their TTL has passed."""
+        cache = LRUCache(maxsize=2, ttl=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+class TestMakeCacheKey:
+    """Test cases for make_cache_key."""
+
+    def test_same_parts_same_key(self):
+        """Test that identical inputs produce identical keys."""
+        assert make_cache_key("svg", "gantt") == make_cache_key("svg", "gantt")
+
+    def test_different_parts_different_key(self):
+        """Test that format is part of the key."""
+        assert make_cache_key("svg", "gantt") != make_cache_key("png", "gantt")
+
+
+class TestCachedRender:
+    """Test cases for cached_render."""
+
+    @pytest.mark.asyncio
+    async def test_renders_once_per_code_and_format(self):
+        """Test that repeated input is served from the cache."""
+        cache = LRUCache(maxsize=4)
+        calls = []
+
+        async def render(code, fmt):
+            calls.append((code, fmt))
+            return f"{fmt}:{code}".encode()
+
+        assert await cached_render(cache, render, "a", "svg") == b"svg:a"
+        assert await cached_render(cache, render, "a", "svg") == b"svg:a"
+        assert await cached_render(cache, render, "a", "png") == b"png:a"
+        assert calls == [("a", "svg"), ("a", "png")]
+
+    @pytest.mark.asyncio
+    async def test_failed_render_is_not_cached(self):
+        """Test that an exception propagates and leaves the cache empty."""
+        cache = LRUCache(maxsize=4)
+
+        async def render(code, fmt):
+            raise RuntimeError("renderer down")
+
+        with pytest.raises(RuntimeError):
+            await cached_render(cache, render, "a", "svg")
+        assert len(cache) == 0
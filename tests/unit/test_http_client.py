@@ -0,0 +1,23 @@
+"""
+Unit tests for the shared HTTP client.
+"""
+import pytest
+from app.utils import http_client
+
+
+class TestGetHttpClient:
+    """Test cases for get_http_client."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_client(self, monkeypatch):
+        monkeypatch.setattr(http_client, "_client", None)
+
+    def test_reuses_client(self):
+        """Test that repeated calls share one client."""
+        assert http_client.get_http_client() is http_client.get_http_client()
+
+    def test_http2_enabled_with_h2(self):
+        """Test that HTTP/2 is negotiated when the httpx[http2] dependency is installed."""
+        pytest.importorskip("h2")
+        assert http_client.HTTP2_AVAILABLE
+        assert http_client.get_http_client()._transport._pool._http2
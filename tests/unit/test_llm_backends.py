@@ -0,0 +1,197 @@
+"""
+Unit tests for the raw LLM backends.
+"""
+import json
+
+import httpx
+import pytest
+from app.core.config import settings
+from app.services.llm_backends import (
+    RawGeminiBackend,
+    RawNVIDIABackend,
+    RawOpenAIBackend,
+    create_raw_backend
+)
+from app.utils import http_client
+
+
+@pytest.fixture
+def mock_http(monkeypatch):
+    """Route the shared HTTP client through a MockTransport with a settable reply."""
+    state = {"requests": [], "response": httpx.Response(200, json={})}
+
+    def handler(request):
+        state["requests"].append(request)
+        return state["response"]
+
+    monkeypatch.setattr(
+        http_client, "_client",
+        httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    return state
+
+
+def chat_completion(content, total_tokens=None):
+    """Build an OpenAI chat completion response body."""
+    body = {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "test-model",
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": content}
+        }]
+    }
+    if total_tokens is not None:
+        body["usage"] = {
+            "prompt_tokens": 1,
+            "completion_tokens": total_tokens - 1,
+            "total_tokens": total_tokens
+        }
+    return body
+
+
+class TestRawOpenAIBackend:
+    """Test cases for RawOpenAIBackend and RawNVIDIABackend."""
+
+    @pytest.fixture(autouse=True)
+    def require_openai(self):
+        pytest.importorskip("openai")
+
+    @pytest.mark.asyncio
+    async def test_parses_content_and_usage(self, mock_http):
+        """Test that the message content and total tokens are returned."""
+        mock_http["response"] = httpx.Response(200, json=chat_completion("digraph {}", 42))
+        backend = RawOpenAIBackend("sk-test", "gpt-test", "https://llm.test/v1")
+
+        content, tokens = await backend.generate("system", "user", 128)
+
+        assert (content, tokens) == ("digraph {}", 42)
+        request = mock_http["requests"][0]
+        assert str(request.url) == "https://llm.test/v1/chat/completions"
+        assert request.headers["authorization"] == "Bearer sk-test"
+        body = json.loads(request.content)
+        assert body["model"] == "gpt-test"
+        assert body["max_tokens"] == 128
+        assert body["messages"] == [
+            {"role": "system", "content": "system"},
+            {"role": "user", "content": "user"}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_missing_content_and_usage(self, mock_http):
+        """Test that a null message and absent usage become ("", None)."""
+        mock_http["response"] = httpx.Response(200, json=chat_completion(None))
+        backend = RawOpenAIBackend("sk-test", "gpt-test", "https://llm.test/v1")
+
+        assert await backend.generate("system", "user", 128) == ("", None)
+
+    @pytest.mark.asyncio
+    async def test_nvidia_uses_default_base_url(self, mock_http):
+        """Test that the NVIDIA backend targets the NIM endpoint by default."""
+        mock_http["response"] = httpx.Response(200, json=chat_completion("graph", 7))
+        backend = RawNVIDIABackend("nv-test", "nim-test")
+
+        assert await backend.generate("system", "user", 64) == ("graph", 7)
+        assert str(mock_http["requests"][0].url) == (
+            f"{RawNVIDIABackend.DEFAULT_BASE_URL}/chat/completions"
+        )
+
+
+class TestRawGeminiBackend:
+    """Test cases for RawGeminiBackend."""
+
+    @pytest.mark.asyncio
+    async def test_parses_parts_and_usage(self, mock_http):
+        """Test that all text parts are joined and the token count is read."""
+        mock_http["response"] = httpx.Response(200, json={
+            "candidates": [{"content": {"parts": [{"text": "digraph "}, {"text": "{}"}]}}],
+            "usageMetadata": {"totalTokenCount": 17}
+        })
+        backend = RawGeminiBackend("g-test", "gemini-test")
+
+        content, tokens = await backend.generate("system", "user", 256)
+
+        assert (content, tokens) == ("digraph {}", 17)
+        request = mock_http["requests"][0]
+        assert request.url.path.endswith("/models/gemini-test:generateContent")
+        assert request.headers["x-goog-api-key"] == "g-test"
+        body = json.loads(request.content)
+        assert body["systemInstruction"] == {"parts": [{"text": "system"}]}
+        assert body["contents"] == [{"role": "user", "parts": [{"text": "user"}]}]
+        assert body["generationConfig"]["maxOutputTokens"] == 256
+
+    @pytest.mark.asyncio
+    async def test_empty_candidates(self, mock_http):
+        """Test that a response without candidates yields empty content."""
+        mock_http["response"] = httpx.Response(200, json={})
+        backend = RawGeminiBackend("g-test", "gemini-test")
+
+        assert await backend.generate("system", "user", 256) == ("", None)
+
+    @pytest.mark.asyncio
+    async def test_error_status_raises(self, mock_http):
+        """Test that an error status is surfaced as HTTPStatusError."""
+        mock_http["response"] = httpx.Response(429, json={"error": "quota"})
+        backend = RawGeminiBackend("g-test", "gemini-test")
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await backend.generate("system", "user", 256)
+
+
+class TestCreateRawBackend:
+    """Test cases for create_raw_backend provider dispatch."""
+
+    @pytest.fixture(autouse=True)
+    def configured(self, monkeypatch, mock_http):
+        for key, value in {
+            "OPENAI_API_KEY": "sk-test",
+            "OPENAI_MODEL": "gpt-main",
+            "OPENAI_FAST_MODEL": "gpt-fast",
+            "OPENAI_BASE_URL": None,
+            "NVIDIA_API_KEY": "nv-test",
+            "NVIDIA_MODEL": "nim-main",
+            "NVIDIA_FAST_MODEL": "nim-fast",
+            "NVIDIA_BASE_URL": None,
+            "GOOGLE_API_KEY": "g-test",
+            "GEMINI_MODEL": "gemini-main",
+            "GEMINI_FAST_MODEL": "gemini-fast",
+        }.items():
+            monkeypatch.setattr(settings, key, value)
+
+    def test_gemini(self):
+        """Test that gemini builds a RawGeminiBackend with the primary model."""
+        backend = create_raw_backend("gemini")
+        assert isinstance(backend, RawGeminiBackend)
+        assert backend.model == "gemini-main"
+
+    def test_gemini_fast(self):
+        """Test that fast=True selects the fast model tier."""
+        assert create_raw_backend("gemini", fast=True).model == "gemini-fast"
+
+    @pytest.mark.parametrize("provider, backend_class, model", [
+        ("openai", RawOpenAIBackend, "gpt-main"),
+        ("nvidia", RawNVIDIABackend, "nim-main"),
+    ])
+    def test_openai_compatible(self, provider, backend_class, model):
+        """Test that OpenAI-compatible providers build the matching backend."""
+        pytest.importorskip("openai")
+        backend = create_raw_backend(provider)
+        assert type(backend) is backend_class
+        assert backend.model == model
+
+    def test_missing_key_returns_none(self, monkeypatch):
+        """Test that a provider without an API key is not configured."""
+        monkeypatch.setattr(settings, "GOOGLE_API_KEY", None)
+        assert create_raw_backend("gemini") is None
+
+    def test_missing_fast_model_returns_none(self, monkeypatch):
+        """Test that fast=True without a fast model is not configured."""
+        monkeypatch.setattr(settings, "GEMINI_FAST_MODEL", None)
+        assert create_raw_backend("gemini", fast=True) is None
+
+    def test_unknown_provider_returns_none(self):
+        """Test that an unknown provider is not configured."""
+        assert create_raw_backend("anthropic") is None
@@ -0,0 +1,322 @@
+"""
+Unit tests for LLM service.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from tenacity import wait_none
+from app.services import llm_service as llm_service_module
+from app.services.llm_service import _is_retryable, _response_cache
+from app.utils.cache import make_cache_key
+from app.core.exceptions import LLMError, ValidationError
+
+
+class TestExtractDot:
+    """Test cases for DOT extraction."""
+
+    def test_extract_from_code_fence(self, llm_service):
+        """Test extraction of fenced DOT code."""
+        response = "Here you go:\n```dot\ndigraph g {\n    A -> B;\n}\n```"
+        assert llm_service._extract_dot(response) == "digraph g {\n    A -> B;\n}"
+
+    def test_extract_without_code_fence(self, llm_service):
+        """Test extraction of unfenced DOT code."""
+        assert llm_service._extract_dot("graph g { A -- B; }") == "graph g { A -- B; }"
+
+    def test_rejects_missing_declaration(self, llm_service):
+        """Test rejection of output without a graph declaration."""
+        with pytest.raises(LLMError, match="must contain"):
+            llm_service._extract_dot("A -> B;")
+
+    def test_rejects_missing_body(self, llm_service):
+        """Test rejection of a declaration without a braced body."""
+        with pytest.raises(LLMError, match="Malformed DOT code"):
+            llm_service._extract_dot("digraph g A -> B;")
+
+    @pytest.mark.parametrize("code", [
+        "Digraph G {a->b}",
+        "STRICT DIGRAPH G { a -> b }",
+        "// generated flow\ndigraph g { a -> b; }",
+        "/* flow\n   chart */\ndigraph g { a -> b; }\n// end",
+    ])
+    def test_accepts_capitalised_and_commented_dot(self, llm_service, code):
+        """Test that keyword case and surrounding comments do not fail the structure check."""
+        assert llm_service._extract_dot(f"```dot\n{code}\n```") == code
+
+
+class TestExtractMermaid:
+    """Test cases for Mermaid Gantt extraction."""
+
+    def test_extract_from_code_fence(self, llm_service):
+        """Test extraction of fenced Mermaid code."""
+        code = "gantt\n    dateFormat YYYY-MM-DD\n    section A\n    Task :t1, 2024-01-01, 3d"
+        assert llm_service._extract_mermaid(f"```mermaid\n{code}\n```") == code
+
+    def test_rejects_missing_sections(self, llm_service):
+        """Test rejection of Gantt code without sections."""
+        with pytest.raises(LLMError, match="Malformed Mermaid code"):
+            llm_service._extract_mermaid("gantt\n    title Incomplete")
+
+
+class TestExtractPlantUML:
+    """Test cases for PlantUML extraction."""
+
+    def test_adds_missing_tags(self, llm_service):
+        """Test that missing start/end tags are added."""
+        code = llm_service._extract_plantuml("* Project\n** Phase 1")
+        assert code == "@startwbs\n* Project\n** Phase 1\n@endwbs"
+
+
+class TestIsRetryable:
+    """Test cases for the retry predicate."""
+
+    def test_malformed_output_is_retried(self):
+        """Test that LLMErrors without a cause (bad output) are retried."""
+        assert _is_retryable(LLMError("Invalid DOT code"))
+
+    def test_timeout_is_retried(self):
+        """Test that wrapped timeouts are retried."""
+        error = LLMError("LLM API call failed")
+        error.__cause__ = TimeoutError()
+        assert _is_retryable(error)
+
+    def test_rate_limit_message_is_retried(self):
+        """Test that untyped 429 provider errors are retried."""
+        error = LLMError("LLM API call failed")
+        error.__cause__ = Exception("[429] Too Many Requests")
+        assert _is_retryable(error)
+
+    def test_http_server_error_is_retried(self):
+        """Test that 5xx responses from raw backends are retried."""
+        request = httpx.Request("POST", "https://example.com")
+        error = LLMError("LLM API call failed")
+        error.__cause__ = httpx.HTTPStatusError(
+            "Server error", request=request, response=httpx.Response(503, request=request)
+        )
+        assert _is_retryable(error)
+
+    def test_permanent_error_fails_fast(self):
+        """Test that non-transient provider errors are not retried."""
+        error = LLMError("LLM API call failed")
+        error.__cause__ = ValueError("invalid api key")
+        assert not _is_retryable(error)
+
+
+class TestStreamCode:
+    """Test cases for streamed generation."""
+
+    @pytest.mark.asyncio
+    async def test_fallback_stream_yields_extractable_code(self, llm_service):
+        """Test that the fallback stream joins into valid DOT code."""
+        chunks = [chunk async for chunk in llm_service.stream_dot_code("A to B")]
+        code = llm_service.extract_code("".join(chunks), "graphviz")
+        assert code.startswith(("digraph", "graph"))
+
+    @pytest.mark.asyncio
+    async def test_slot_released_before_client_reads(self, llm_service, monkeypatch):
+        """Test that a slow reader does not hold the LLM semaphore."""
+        class StubLLM:
+            async def astream(self, messages):
+                for content in ("digraph g ", "{ a -> b; }"):
+                    yield SimpleNamespace(content=content)
+
+        semaphore = asyncio.Semaphore(1)
+        monkeypatch.setattr(llm_service_module, "_llm_semaphore", semaphore)
+        llm_service.llm = StubLLM()
+        llm_service._use_llm = True
+
+        stream = llm_service.stream_dot_code("A to B")
+        assert await anext(stream) == "digraph g "
+        # The client has not read the second chunk, yet the slot is free
+        await asyncio.wait_for(semaphore.acquire(), timeout=1)
+        semaphore.release()
+        assert [chunk async for chunk in stream] == ["{ a -> b; }"]
+
+    @pytest.mark.asyncio
+    async def test_provider_error_becomes_llm_error(self, llm_service):
+        """Test that a failure inside the buffered producer surfaces as LLMError."""
+        class StubLLM:
+            async def astream(self, messages):
+                yield SimpleNamespace(content="digraph")
+                raise RuntimeError("connection reset")
+
+        llm_service.llm = StubLLM()
+        llm_service._use_llm = True
+
+        with pytest.raises(LLMError, match="connection reset"):
+            [chunk async for chunk in llm_service.stream_dot_code("A to B")]
+
+
+class TestPickLLM:
+    """Test cases for model tier routing."""
+
+    def test_short_prompt_uses_fast_model(self, llm_service):
+        """Test that short prompts for simple kinds use the fast tier."""
+        llm_service.llm, llm_service.llm_fast = object(), object()
+        assert llm_service._pick_llm("login flow", "graphviz") is llm_service.llm_fast
+
+    def test_gantt_uses_primary_model(self, llm_service):
+        """Test that Gantt prompts always use the primary model."""
+        llm_service.llm, llm_service.llm_fast = object(), object()
+        assert llm_service._pick_llm("plan", "mermaid_gantt") is llm_service.llm
+
+    def test_without_fast_model_uses_primary(self, llm_service):
+        """Test that routing is a no-op when no fast model is configured."""
+        llm_service.llm = object()
+        assert llm_service._pick_llm("login flow", "graphviz") is llm_service.llm
+
+
+class TestValidatePrompt:
+    """Test cases for prompt pre-validation."""
+
+    def test_rejects_blank_prompt(self, llm_service):
+        """Test that whitespace-only prompts are rejected."""
+        with pytest.raises(ValidationError, match="too short"):
+            llm_service._validate_prompt("   ", "graphviz", 1024)
+
+    def test_rejects_oversized_prompt(self, llm_service):
+        """Test that prompts over MAX_PROMPT_LENGTH are rejected."""
+        with pytest.raises(ValidationError, match="too long"):
+            llm_service._validate_prompt("x" * 100_000, "graphviz", 1024)
+
+    def test_context_check_covers_reference_prompt(self, llm_service, monkeypatch):
+        """Test that the window check sizes for the reference prompt a retry escalates to."""
+        tokens = llm_service._SYSTEM_PROMPT_TOKENS
+        assert tokens["mermaid_gantt_reference"] > tokens["mermaid_gantt"]
+        monkeypatch.setattr(
+            llm_service_module.settings, "LLM_CONTEXT_WINDOW", tokens["mermaid_gantt"] + 1100
+        )
+        with pytest.raises(ValidationError, match="too long"):
+            llm_service._validate_prompt("Plan a product launch", "mermaid_gantt", 1024)
+
+    @pytest.mark.asyncio
+    async def test_generate_fails_before_llm_call(self, llm_service):
+        """Test that generation validates before any LLM work."""
+        with pytest.raises(ValidationError):
+            await llm_service.generate_dot_code("")
+
+
+class TestSingleFlight:
+    """Test cases for coalescing concurrent identical generations."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_prompts_share_one_call(self, llm_service):
+        """Test that identical in-flight prompts trigger a single LLM call."""
+        calls = []
+
+        class StubLLM:
+            async def ainvoke(self, messages):
+                calls.append(messages)
+                await asyncio.sleep(0.01)
+                return SimpleNamespace(content="digraph g { a -> b; }", response_metadata={})
+
+        llm_service.llm = StubLLM()
+        llm_service._use_llm = True
+
+        results = await asyncio.gather(
+            llm_service.generate_dot_code("single-flight test prompt"),
+            llm_service.generate_dot_code("single-flight test prompt")
+        )
+
+        assert len(calls) == 1
+        assert results[0][0] == results[1][0] == "digraph g { a -> b; }"
+
+
+class TestGenerateBatch:
+    """Test cases for batched generation."""
+
+    @staticmethod
+    def _stub_llm(fail_first=(), always_malformed=()):
+        """Build a stub LLM that records prompts and can fail specific ones."""
+        class StubLLM:
+            calls = []
+
+            async def ainvoke(self, messages):
+                prompt = messages[-1].content
+                StubLLM.calls.append(prompt)
+                if prompt in always_malformed:
+                    return SimpleNamespace(content="not a diagram", response_metadata={})
+                if prompt in fail_first and StubLLM.calls.count(prompt) == 1:
+                    raise ConnectionError("connection reset")
+                return SimpleNamespace(
+                    content=f"digraph g {{ \"{prompt}\" -> b; }}",
+                    response_metadata={}
+                )
+
+        return StubLLM()
+
+    @pytest.mark.asyncio
+    async def test_serves_cache_hits_and_calls_misses(self, llm_service):
+        """Test that cached prompts skip the LLM and results keep prompt order."""
+        llm_service.llm = stub = self._stub_llm()
+        llm_service._use_llm = True
+        _response_cache.set(
+            make_cache_key("graphviz", "batch cached prompt", "1024"),
+            "digraph cached { a -> b; }"
+        )
+
+        results = await llm_service.generate_batch(
+            ["batch miss one", "batch cached prompt", "batch miss two"], "graphviz"
+        )
+
+        assert stub.calls == ["batch miss one", "batch miss two"]
+        assert [code for code, _, _ in results] == [
+            'digraph g { "batch miss one" -> b; }',
+            "digraph cached { a -> b; }",
+            'digraph g { "batch miss two" -> b; }',
+        ]
+        assert results[1][1] is None
+
+    @pytest.mark.asyncio
+    async def test_failed_item_is_retried_individually(self, llm_service, monkeypatch):
+        """Test that a transient failure is retried for that item without failing the batch."""
+        monkeypatch.setattr(llm_service_module, "wait_exponential_jitter", lambda **_: wait_none())
+        llm_service.llm = stub = self._stub_llm(fail_first={"batch flaky prompt"})
+        llm_service._use_llm = True
+
+        results = await llm_service.generate_batch(
+            ["batch flaky prompt", "batch steady prompt"], "graphviz"
+        )
+
+        assert stub.calls.count("batch flaky prompt") == 2
+        assert stub.calls.count("batch steady prompt") == 1
+        assert results[0][0] == 'digraph g { "batch flaky prompt" -> b; }'
+
+    @pytest.mark.asyncio
+    async def test_item_failing_after_retries_raises(self, llm_service):
+        """Test that an item still malformed after its retries raises LLMError."""
+        llm_service.llm = self._stub_llm(always_malformed={"batch broken prompt"})
+        llm_service._use_llm = True
+
+        with pytest.raises(LLMError):
+            await llm_service.generate_batch(
+                ["batch broken prompt", "batch fine prompt"], "graphviz", max_retries=1
+            )
+
+
+class TestInitChatModels:
+    """Test cases for building the LangChain chat models."""
+
+    def _build(self, llm_service, monkeypatch, model_fields):
+        """Run _init_chat_models against a stub chat model class."""
+        class StubChatModel:
+            def __init__(self, **kwargs):
+                self.kwargs = kwargs
+
+        StubChatModel.model_fields = model_fields
+        monkeypatch.setattr(llm_service_module, "_load_chat_model_class", lambda provider: StubChatModel)
+        llm_service.provider = "openai"
+        llm_service._init_chat_models({"model": "m", "http_async_client": object()}, None)
+        return llm_service.llm.kwargs
+
+    def test_passes_shared_client_when_supported(self, llm_service, monkeypatch):
+        """Test that the shared HTTP client is passed to models that accept it."""
+        kwargs = self._build(llm_service, monkeypatch, {"model": None, "http_async_client": None})
+        assert "http_async_client" in kwargs
+
+    def test_drops_shared_client_on_old_releases(self, llm_service, monkeypatch):
+        """Test that models without the field never receive it as a model kwarg."""
+        kwargs = self._build(llm_service, monkeypatch, {"model": None})
+        assert kwargs == {"model": "m"}
@@ -0,0 +1,50 @@
+"""
+Unit tests for the logging utilities.
+"""
+import json
+import logging
+import sys
+
+import pytest
+from app.utils import logger as logger_module
+from app.utils.logger import JsonFormatter
+
+
+class TestJsonFormatter:
+    """Test cases for JsonFormatter."""
+
+    def _record(self, msg, *args, exc_info=None):
+        record = logging.LogRecord(
+            "app.test", logging.INFO, __file__, 1, msg, args, exc_info
+        )
+        record.request_id = "abc123"
+        return record
+
+    def test_formats_record_as_json(self):
+        """Test that a record is serialized with its message arguments applied."""
+        output = JsonFormatter().format(self._record("Rendered %d bytes", 42))
+        entry = json.loads(output)
+        assert entry["msg"] == "Rendered 42 bytes"
+        assert entry["lvl"] == "INFO"
+        assert entry["name"] == "app.test"
+        assert entry["rid"] == "abc123"
+        assert isinstance(entry["ts"], float)
+
+    def test_includes_exception_text(self):
+        """Test that exception info is included in the JSON output."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = self._record("failed", exc_info=sys.exc_info())
+        entry = json.loads(JsonFormatter().format(record))
+        assert "ValueError: boom" in entry["exc"]
+
+    @pytest.mark.parametrize("use_orjson", [False, True])
+    def test_serializer_backends(self, monkeypatch, use_orjson):
+        """Test JSON output with the stdlib json fallback and with orjson."""
+        monkeypatch.setattr(
+            logger_module, "orjson", pytest.importorskip("orjson") if use_orjson else None
+        )
+        output = JsonFormatter().format(self._record("Rendered %s", "héllo ✓"))
+        assert "héllo ✓" in output
+        assert json.loads(output)["msg"] == "Rendered héllo ✓"
@@ -0,0 +1,26 @@
+"""
+Unit tests for application lifespan handling.
+"""
+import pytest
+from app.main import app, lifespan
+from app.services.llm_service import get_llm_service
+from app.utils import http_client
+
+
+class TestLifespan:
+    """Test cases for the application lifespan."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("llm_service")
+    async def test_shutdown_drops_cached_llm_service(self):
+        """Test that shutdown closes the HTTP client and clears the cached LLMService."""
+        get_llm_service.cache_clear()
+        async with lifespan(app):
+            first = get_llm_service()
+            client = http_client.get_http_client()
+
+        assert client.is_closed
+        assert http_client._client is None
+        assert get_llm_service.cache_info().currsize == 0
+        assert get_llm_service() is not first
+        get_llm_service.cache_clear()
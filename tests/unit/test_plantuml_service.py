@@ -0,0 +1,95 @@
+"""
+Unit tests for PlantUML service.
+"""
+import zlib
+
+import httpx
+import pytest
+from app.services.plantuml_service import PlantUMLService
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+from app.utils import http_client
+
+
+def reference_encode(plantuml_text: str) -> str:
+    """Triplet-by-triplet encoder from the PlantUML text-encoding spec."""
+    alphabet = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-_"
+    data = zlib.compress(plantuml_text.encode("utf-8"))[2:-4]
+    result = []
+    for i in range(0, len(data), 3):
+        b1 = data[i]
+        b2 = data[i + 1] if i + 1 < len(data) else 0
+        b3 = data[i + 2] if i + 2 < len(data) else 0
+        result.append(alphabet[b1 >> 2])
+        result.append(alphabet[((b1 & 0x3) << 4) | (b2 >> 4)])
+        result.append(alphabet[((b2 & 0xF) << 2) | (b3 >> 6)])
+        result.append(alphabet[b3 & 0x3F])
+    return "".join(result)
+
+
+class TestPlantUMLService:
+    """Test cases for PlantUMLService."""
+
+    @pytest.mark.parametrize("text", [
+        "@startwbs\n* A\n@endwbs",
+        "@startwbs\n* Project\n** Phase 1\n*** Task\n** Phase 2\n@endwbs",
+        "@startuml\nAlice -> Bob: héllo ✓\n@enduml",
+        "x" * 1000,
+    ])
+    def test_encode_matches_reference(self, text):
+        """Test that the fast encoder matches the reference for every padding case."""
+        assert PlantUMLService._encode_plantuml(text) == reference_encode(text)
+
+    def test_validate_requires_start_tag(self):
+        """Test PlantUML validation without a start tag."""
+        with pytest.raises(ValidationError, match="must start with"):
+            PlantUMLService.validate_plantuml_syntax("* Project\n@endwbs")
+
+    def test_validate_rejects_oversized_code(self):
+        """Test that code over MAX_PLANTUML_LENGTH is rejected before encoding."""
+        code = "@startwbs\n" + "* node\n" * 10000 + "@endwbs"
+        with pytest.raises(ValidationError, match="exceeds the limit"):
+            PlantUMLService.validate_plantuml_syntax(code)
+
+
+class TestRenderWBSToBytes:
+    """Test cases for PlantUMLService.render_wbs_to_bytes."""
+
+    @pytest.fixture
+    def requests_seen(self, monkeypatch):
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, content=b"<svg/>")
+
+        monkeypatch.setattr(
+            http_client, "_client",
+            httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        return seen
+
+    @pytest.mark.asyncio
+    async def test_get_with_encoded_url(self, requests_seen, monkeypatch):
+        """Test that the default mode encodes the diagram into a GET URL."""
+        monkeypatch.setattr(settings, "PLANTUML_USE_POST", False)
+        code = "@startwbs\n* Project\n@endwbs"
+
+        output = await PlantUMLService.render_wbs_to_bytes(code, "svg")
+
+        assert output == b"<svg/>"
+        assert requests_seen[0].method == "GET"
+        assert requests_seen[0].url.path.endswith("/svg/" + reference_encode(code))
+
+    @pytest.mark.asyncio
+    async def test_post_sends_raw_source(self, requests_seen, monkeypatch):
+        """Test that PLANTUML_USE_POST sends the source as the request body."""
+        monkeypatch.setattr(settings, "PLANTUML_USE_POST", True)
+        code = "@startwbs\n* Project\n@endwbs"
+
+        output = await PlantUMLService.render_wbs_to_bytes(code, "png")
+
+        assert output == b"<svg/>"
+        assert requests_seen[0].method == "POST"
+        assert requests_seen[0].url.path.endswith("/png")
+        assert requests_seen[0].content == code.encode("utf-8")
@@ -0,0 +1,70 @@
+"""
+Unit tests for the async rate limiter.
+"""
+from types import SimpleNamespace
+
+import pytest
+from app.utils import rate_limiter
+from app.utils.rate_limiter import AsyncRateLimiter
+
+
+class FakeClock:
+    """Deterministic stand-in for time.monotonic and asyncio.sleep."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(rate_limiter, "asyncio", SimpleNamespace(sleep=clock.sleep))
+    return clock
+
+
+class TestAsyncRateLimiter:
+    """Test cases for AsyncRateLimiter."""
+
+    @pytest.mark.asyncio
+    async def test_zero_rate_disables_limiting(self, clock):
+        """Test that max_rate=0 never waits."""
+        limiter = AsyncRateLimiter(0)
+        for _ in range(100):
+            async with limiter:
+                pass
+        assert clock.sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_allows_burst_then_waits(self, clock):
+        """Test that a full bucket is drained immediately and the next call waits one interval."""
+        limiter = AsyncRateLimiter(5, time_period=0.5)
+        for _ in range(5):
+            await limiter.acquire()
+        assert clock.sleeps == []
+
+        await limiter.acquire()
+        assert clock.sleeps == [pytest.approx(0.1)]
+
+    @pytest.mark.asyncio
+    async def test_refills_over_time(self, clock):
+        """Test that elapsed time restores tokens up to the burst size."""
+        limiter = AsyncRateLimiter(5, time_period=0.5)
+        for _ in range(5):
+            await limiter.acquire()
+
+        clock.now += 10
+        for _ in range(5):
+            await limiter.acquire()
+        assert clock.sleeps == []
+
+        await limiter.acquire()
+        assert clock.sleeps == [pytest.approx(0.1)]
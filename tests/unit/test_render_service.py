@@ -1,7 +1,13 @@
 """
 Unit tests for render service.
 """
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import graphviz
 import pytest
+from app.services import render_service
 from app.services.render_service import RenderService
 from app.core.exceptions import ValidationError
 
@@ -29,6 +35,12 @@ class TestRenderService:
         with pytest.raises(ValidationError, match="Unbalanced braces"):
             RenderService.validate_dot_syntax("digraph test { A -> B;")
     
+    def test_validate_dot_syntax_too_long(self):
+        """Test DOT validation rejects code over MAX_DOT_LENGTH."""
+        dot = "digraph test { " + "A -> B; " * 10000 + "}"
+        with pytest.raises(ValidationError, match="exceeds the limit"):
+            RenderService.validate_dot_syntax(dot)
+    
     def test_get_format_mime_type_svg(self):
         """Test MIME type for SVG format."""
         mime_type = RenderService.get_format_mime_type("svg")
@@ -44,3 +56,71 @@ class TestRenderService:
         mime_type = RenderService.get_format_mime_type("unknown")
         assert mime_type == "application/octet-stream"
 
+
+class TestRenderToBytes:
+    """Test cases for RenderService.render_to_bytes."""
+
+    @pytest.mark.asyncio
+    async def test_render_does_not_block_event_loop(self, sample_dot_code, monkeypatch):
+        """Test that the Graphviz subprocess call runs in a worker thread."""
+        loop_thread = threading.current_thread()
+        started = threading.Event()
+        release = threading.Event()
+        pipe_threads = []
+
+        def blocking_pipe(self, format=None, encoding=None):
+            pipe_threads.append(threading.current_thread())
+            started.set()
+            # Only returns once the event loop, still running, releases it
+            release.wait(timeout=5)
+            return b"<svg/>"
+
+        monkeypatch.setattr(graphviz.Source, "pipe", blocking_pipe)
+        monkeypatch.setattr(render_service.settings, "GRAPHVIZ_IN_PROCESS", False)
+
+        task = asyncio.create_task(RenderService.render_to_bytes(sample_dot_code))
+        await asyncio.to_thread(started.wait, 5)
+        release.set()
+
+        assert await task == b"<svg/>"
+        assert pipe_threads and pipe_threads[0] is not loop_thread
+
+    @pytest.mark.asyncio
+    async def test_in_process_render_uses_pygraphviz(self, sample_dot_code, monkeypatch):
+        """Test that GRAPHVIZ_IN_PROCESS renders through pygraphviz when available."""
+        calls = []
+
+        class FakeAGraph:
+            def __init__(self, string):
+                calls.append(string)
+
+            def draw(self, format, prog):
+                return f"{format}:{prog}".encode()
+
+        monkeypatch.setattr(render_service, "pygraphviz", SimpleNamespace(AGraph=FakeAGraph))
+        monkeypatch.setattr(render_service.settings, "GRAPHVIZ_IN_PROCESS", True)
+
+        output = await RenderService.render_to_bytes(sample_dot_code, fmt="png", engine="neato")
+
+        assert output == b"png:neato"
+        assert calls == [sample_dot_code]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("in_process", [True, False])
+    async def test_render_holds_semaphore(self, sample_dot_code, monkeypatch, in_process):
+        """Test that both render modes run under the render semaphore."""
+        semaphore = asyncio.Semaphore(1)
+        held = []
+
+        def render(*args, **kwargs):
+            held.append(semaphore.locked())
+            return b"<svg/>"
+
+        monkeypatch.setattr(render_service, "_render_semaphore", semaphore)
+        monkeypatch.setattr(render_service, "_render_in_process", render)
+        monkeypatch.setattr(graphviz.Source, "pipe", render)
+        monkeypatch.setattr(render_service, "pygraphviz", SimpleNamespace())
+        monkeypatch.setattr(render_service.settings, "GRAPHVIZ_IN_PROCESS", in_process)
+
+        assert await RenderService.render_to_bytes(sample_dot_code) == b"<svg/>"
+        assert held == [True]
@@ -0,0 +1,62 @@
+"""
+Unit tests for WBS service.
+"""
+from types import SimpleNamespace
+
+import pytest
+from app.services.wbs_service import WBSService, _render_cache
+from app.core.exceptions import DiagramGenerationError, LLMError
+
+
+@pytest.fixture
+def wbs_service() -> WBSService:
+    """WBS service with stubbed LLM and PlantUML layers."""
+    service = WBSService()
+    renders = []
+
+    async def generate_wbs_code(prompt, max_tokens):
+        if prompt == "fail":
+            raise LLMError("LLM unavailable")
+        return f"@startwbs\n* {prompt}\n@endwbs", 10, 5
+
+    async def render_wbs_to_bytes(plantuml_code, fmt):
+        renders.append(plantuml_code)
+        return plantuml_code.encode()
+
+    service.llm_service = SimpleNamespace(generate_wbs_code=generate_wbs_code)
+    service.plantuml_service = SimpleNamespace(render_wbs_to_bytes=render_wbs_to_bytes)
+    service.renders = renders
+    _render_cache.clear()
+    return service
+
+
+class TestGenerateWBSBatch:
+    """Test cases for WBSService.generate_wbs_batch."""
+
+    @pytest.mark.asyncio
+    async def test_returns_results_in_prompt_order(self, wbs_service):
+        """Test that each prompt gets its own diagram, in order."""
+        results = await wbs_service.generate_wbs_batch(["Alpha", "Beta"])
+
+        assert [code for _, code in results] == [
+            "@startwbs\n* Alpha\n@endwbs",
+            "@startwbs\n* Beta\n@endwbs",
+        ]
+        assert results[0][0] == b"@startwbs\n* Alpha\n@endwbs"
+
+    @pytest.mark.asyncio
+    async def test_identical_code_is_rendered_once(self, wbs_service):
+        """Test that a repeated diagram is served from the render cache."""
+        await wbs_service.generate_wbs_batch(["Alpha"])
+        await wbs_service.generate_wbs_batch(["Alpha", "Beta"])
+
+        assert wbs_service.renders == [
+            "@startwbs\n* Alpha\n@endwbs",
+            "@startwbs\n* Beta\n@endwbs",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failing_item_raises(self, wbs_service):
+        """Test that one failed generation fails the batch."""
+        with pytest.raises(DiagramGenerationError):
+            await wbs_service.generate_wbs_batch(["Alpha", "fail"])